@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Times compose_design.py, render_design.py and export_glb.py on synthetic inputs.
+
+Generates seeded synthetic templates (2x2 panel atlases with white fabric on a
+transparent background) and designs at each size, then measures:
+
+  functions   load_template (plain and recolored), scale_design, composite_design
+              and save_output, in a fresh process per size with peak RSS per function
+  compose     compose_design.py end to end
+  render      render_design.py end to end (one camera, stills only), with its phases
+  export      export_glb.py end to end, with its phases
+
+Every benchmark runs --repeat times and reports min/median/mean; end-to-end runs
+report the peak RSS of the child process. The render and export suites need
+Blender and the .blend template and are skipped (and listed in the report) when
+either is missing.
+
+Usage:
+  python3 scripts/benchmark.py [--sizes 1024,2048,4096,8192] [--repeat 3]
+                               [--suites functions,compose,render,export]
+                               [--report output/benchmark.json]
+                               [--baseline output/benchmark-main.json]
+
+Examples:
+  # Quick compose-only run
+  python3 scripts/benchmark.py --sizes 1024,2048 --suites functions,compose
+
+  # Save a baseline on main, then compare a branch against it
+  python3 scripts/benchmark.py --report output/benchmark-main.json
+  python3 scripts/benchmark.py --baseline output/benchmark-main.json --fail-on-regression
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from PIL import Image, ImageDraw, __version__ as PILLOW_VERSION  # noqa: E402
+
+import compose_design  # noqa: E402
+
+# Bump when the inputs or the measured work change, so old baselines are not compared
+BENCHMARK_VERSION = 1
+
+DEFAULT_SIZES = (1024, 2048, 4096, 8192)
+SUITES = ('functions', 'compose', 'render', 'export')
+DEFAULT_BLEND = PROJECT_ROOT / 'assets' / 'original-blender-template.blend'
+DEFAULT_PRESET = 'chest-large'
+DEFAULT_FABRIC_COLOR = 'navy'
+DEFAULT_RENDER_CAMERA = 'front_0deg'
+DEFAULT_RENDER_SAMPLES = 16
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MB, or None."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return round(peak / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)
+
+
+def reset_peak_rss():
+    """Reset the peak RSS high-water mark where the kernel allows it (Linux)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def summarize(runs_ms: list) -> dict:
+    """Return min/median/mean/stdev of a list of run times."""
+    return {
+        'runs_ms': runs_ms,
+        'min_ms': round(min(runs_ms), 2),
+        'median_ms': round(statistics.median(runs_ms), 2),
+        'mean_ms': round(statistics.mean(runs_ms), 2),
+        'stdev_ms': round(statistics.stdev(runs_ms), 2) if len(runs_ms) > 1 else 0.0
+    }
+
+
+def noise_image(size: tuple, rng: random.Random, scale: int = 8) -> Image.Image:
+    """Return smooth grayscale noise: random values at 1/scale resolution, upscaled."""
+    small = (max(1, size[0] // scale), max(1, size[1] // scale))
+    return Image.frombytes('L', small, rng.randbytes(small[0] * small[1])).resize(size, Image.Resampling.BICUBIC)
+
+
+def make_template(size: int, path: Path, seed: int) -> None:
+    """Write a synthetic size x size template: four white fabric panels on transparency.
+
+    The fabric has a light noise texture (all values above the default
+    recolor threshold) and anti-aliased edges, so PNG decoding and fabric
+    recoloring do representative work.
+    """
+    rng = random.Random(seed)
+    half = size // 2
+    mask = Image.new('L', (size, size), 0)
+    draw = ImageDraw.Draw(mask)
+    for left, top in ((0, 0), (half, 0), (0, half), (half, half)):
+        inset = half // 10
+        draw.rounded_rectangle((left + inset, top + inset, left + half - inset, top + half - inset),
+                               radius=half // 8, fill=255)
+    # Soften the panel edges like the seams of an exported UV atlas
+    mask = mask.resize((size // 4, size // 4), Image.Resampling.BOX).resize((size, size), Image.Resampling.BILINEAR)
+
+    fabric = noise_image((size, size), rng).point(lambda v: 225 + v * 30 // 255)
+    img = Image.merge('RGBA', (fabric, fabric, fabric, mask))
+    img.save(path, 'PNG')
+
+
+def make_design(size: int, path: Path, seed: int) -> None:
+    """Write a synthetic size x size RGBA design: colored noise with opaque shapes."""
+    rng = random.Random(seed)
+    img = Image.merge('RGB', [noise_image((size, size), rng, scale=16) for _ in range(3)])
+    alpha = Image.new('L', (size, size), 0)
+    draw = ImageDraw.Draw(alpha)
+    for _ in range(12):
+        x, y = rng.randrange(size), rng.randrange(size)
+        radius = rng.randrange(size // 16, size // 4)
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=rng.randrange(160, 256))
+    img.putalpha(alpha)
+    img.save(path, 'PNG')
+
+
+def prepare_inputs(work_dir: Path, sizes: list, seed: int) -> dict:
+    """Generate (or reuse) the template and design for each size.
+
+    Designs are half the template size. Returns {size: (template, design)}.
+    """
+    inputs = {}
+    for size in sizes:
+        template = work_dir / f"template_{size}_{seed}.png"
+        design = work_dir / f"design_{size // 2}_{seed}.png"
+        if not template.exists():
+            print(f"Generating {template.name}")
+            make_template(size, template, seed)
+        if not design.exists():
+            print(f"Generating {design.name}")
+            make_design(size // 2, design, seed + 1)
+        inputs[size] = (template, design)
+    return inputs
+
+
+def time_function(fn, repeat: int) -> dict:
+    """Call fn repeat times; return its timings and the peak RSS while it ran."""
+    runs = []
+    reset_peak_rss()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return {**summarize([round(ms, 2) for ms in runs]), 'peak_rss_mb': peak_rss_mb()}
+
+
+def benchmark_functions(template_path: str, design_path: str, output_dir: str, repeat: int) -> dict:
+    """Time the compose_design.py functions for one template (run in a fresh process)."""
+    template_path, design_path = Path(template_path), Path(design_path)
+    fabric_color = compose_design.parse_color(DEFAULT_FABRIC_COLOR)
+    preset = compose_design.get_preset_config(DEFAULT_PRESET)
+
+    template = compose_design.load_template(template_path)
+    template.load()
+    design = compose_design.load_design(design_path)
+    design.load()
+    analysis = compose_design.analyze_template(template)
+    placement = compose_design.calculate_placement(analysis, preset, design.size)
+    scaled = compose_design.scale_design(design, placement['width'], placement['height'])
+    output = compose_design.composite_design(template, design, analysis, preset, scaled_design=scaled)
+
+    def save():
+        with contextlib.redirect_stdout(io.StringIO()):
+            compose_design.save_output(output, Path(output_dir) / 'composited.png')
+
+    return {
+        'load_template': time_function(lambda: compose_design.load_template(template_path).load(), repeat),
+        'load_template_recolor': time_function(
+            lambda: compose_design.load_template(template_path, fabric_color).load(), repeat),
+        'scale_design': time_function(
+            lambda: compose_design.scale_design(design, placement['width'], placement['height']), repeat),
+        'composite_design': time_function(
+            lambda: compose_design.composite_design(template, design, analysis, preset, scaled_design=scaled), repeat),
+        'save_output': time_function(save, repeat)
+    }
+
+
+def run_command(cmd: list, metrics_file: Path = None) -> dict:
+    """Run a command; return its wall time, peak RSS and metrics file phases.
+
+    Raises RuntimeError with the output tail if the command fails.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    with process.stdout:
+        output_chunks = list(iter(lambda: process.stdout.read(65536), b''))
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = (time.perf_counter() - start) * 1000
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        tail = b''.join(output_chunks).decode(errors='replace').strip().splitlines()[-10:]
+        raise RuntimeError(f"{Path(cmd[0]).name} exited with {process.returncode}:\n  " + '\n  '.join(tail))
+
+    result = {'ms': elapsed,
+              'peak_rss_mb': round(usage.ru_maxrss / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)}
+    if metrics_file and metrics_file.exists():
+        with open(metrics_file) as f:
+            result['phases'] = json.load(f).get('phases', [])
+    return result
+
+
+def benchmark_command(make_cmd, repeat: int, metrics_file: Path = None) -> dict:
+    """Run make_cmd(run) repeat times; return timings, the highest peak RSS and the last run's phases."""
+    runs = [run_command(make_cmd(run), metrics_file) for run in range(repeat)]
+    result = {**summarize([round(run['ms'], 2) for run in runs]),
+              'peak_rss_mb': max(run['peak_rss_mb'] for run in runs)}
+    if 'phases' in runs[-1]:
+        result['phases'] = runs[-1]['phases']
+    return result
+
+
+def blender_version(blender: str) -> str:
+    """Return the first line of `blender --version`, or None."""
+    try:
+        result = subprocess.run([blender, '--version'], capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    lines = result.stdout.strip().splitlines()
+    return lines[0] if lines else None
+
+
+def git_commit() -> str:
+    """Return the checked-out commit of the repository, or None."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Compare median times with a baseline report.
+
+    Returns one entry per benchmark present in both, with the median ratio
+    and whether it regressed by more than threshold (a fraction).
+    """
+    previous = {(entry['suite'], entry['name'], entry['size']): entry for entry in baseline.get('results', [])}
+    comparison = []
+    for entry in results:
+        before = previous.get((entry['suite'], entry['name'], entry['size']))
+        if not before or not before.get('median_ms'):
+            continue
+        ratio = entry['median_ms'] / before['median_ms']
+        comparison.append({
+            'suite': entry['suite'], 'name': entry['name'], 'size': entry['size'],
+            'baseline_median_ms': before['median_ms'], 'median_ms': entry['median_ms'],
+            'ratio': round(ratio, 3), 'regression': ratio > 1 + threshold
+        })
+    return comparison
+
+
+def parse_sizes(value: str) -> list:
+    """Parse a comma-separated size list; 1k..8k are accepted as shorthand."""
+    sizes = []
+    for item in value.split(','):
+        item = item.strip().lower()
+        size = int(item[:-1]) * 1024 if item.endswith('k') else int(item)
+        if size < 64 or size % 2:
+            raise argparse.ArgumentTypeError(f"Invalid size '{item}' (even, at least 64)")
+        sizes.append(size)
+    return sizes
+
+
+def main():
+    """Parse args, run the selected suites and write the report."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the compose, render and GLB export scripts on synthetic inputs.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='Examples:' + __doc__.split('Examples:')[1]
+    )
+    parser.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES),
+                        help='Comma-separated template sizes in pixels or 1k..8k (default: 1024,2048,4096,8192)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark (default: 3)')
+    parser.add_argument('--suites', type=str, default=','.join(SUITES),
+                        help=f"Comma-separated suites to run (default: {','.join(SUITES)})")
+    parser.add_argument('--seed', type=int, default=1, help='Seed of the synthetic inputs (default: 1)')
+    parser.add_argument('--work-dir', type=Path, default=None,
+                        help='Keep generated inputs and outputs here and reuse the inputs (default: temporary)')
+    parser.add_argument('--blend', type=Path, default=DEFAULT_BLEND,
+                        help='Blender template for the render and export suites')
+    parser.add_argument('--blender', type=str, default=shutil.which('blender'),
+                        help='Blender executable (default: blender on PATH)')
+    parser.add_argument('--render-samples', type=int, default=DEFAULT_RENDER_SAMPLES,
+                        help=f'Samples of the render benchmark (default: {DEFAULT_RENDER_SAMPLES})')
+    parser.add_argument('--report', type=Path, default=None, help='Write the JSON report to this path')
+    parser.add_argument('--baseline', type=Path, default=None,
+                        help='Earlier report to compare median times against')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent slowdown against the baseline that counts as a regression (default: 10)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 if any benchmark regressed')
+    args = parser.parse_args()
+
+    suites = [suite.strip() for suite in args.suites.split(',') if suite.strip()]
+    unknown = [suite for suite in suites if suite not in SUITES]
+    if unknown:
+        print(f"Error: Unknown suite(s): {', '.join(unknown)}. Available: {', '.join(SUITES)}")
+        sys.exit(1)
+    if args.repeat < 1:
+        print("Error: --repeat must be at least 1")
+        sys.exit(1)
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Failed to read baseline: {e}")
+            sys.exit(1)
+        if baseline.get('version') != BENCHMARK_VERSION:
+            print(f"Warning: Baseline is from benchmark version {baseline.get('version')}, "
+                  f"this is version {BENCHMARK_VERSION}")
+
+    skipped = []
+    blender_suites = [suite for suite in suites if suite in ('render', 'export')]
+    if blender_suites and not args.blender:
+        skipped += [{'suite': suite, 'reason': 'Blender not found'} for suite in blender_suites]
+    elif blender_suites and not args.blend.exists():
+        skipped += [{'suite': suite, 'reason': f"Template {args.blend} not found"} for suite in blender_suites]
+    suites = [suite for suite in suites if suite not in {entry['suite'] for entry in skipped}]
+    for entry in skipped:
+        print(f"Skipping {entry['suite']} benchmarks: {entry['reason']}")
+
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix='benchmark_'))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+
+    def add(suite, name, size, result):
+        results.append({'suite': suite, 'name': name, 'size': size, **result})
+        peak = f", peak {result['peak_rss_mb']} MB" if result.get('peak_rss_mb') else ''
+        print(f"  {suite:<9} {name:<24} {size:>5}px  median {result['median_ms']:>10.1f} ms  "
+              f"min {result['min_ms']:>10.1f} ms{peak}")
+
+    try:
+        inputs = prepare_inputs(work_dir, args.sizes, args.seed)
+        for size in args.sizes:
+            template, design = inputs[size]
+            output_dir = work_dir / f"out_{size}"
+            output_dir.mkdir(exist_ok=True)
+            print(f"\nTemplate {size}x{size}, design {size // 2}x{size // 2}:")
+
+            if 'functions' in suites:
+                # A fresh process per size, so the peak RSS of one size does not carry over
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                    timings = pool.submit(benchmark_functions, str(template), str(design),
+                                          str(output_dir), args.repeat).result()
+                for name, result in timings.items():
+                    add('functions', name, size, result)
+
+            composited = output_dir / 'compose_cli.png'
+            # The render and export suites use the composited texture
+            if 'compose' in suites or (('render' in suites or 'export' in suites) and not composited.exists()):
+                result = benchmark_command(lambda run: [
+                    sys.executable, str(SCRIPT_DIR / 'compose_design.py'), '--template', str(template),
+                    '--design', str(design), '--preset', DEFAULT_PRESET, '--output', str(composited)
+                ], args.repeat if 'compose' in suites else 1)
+                if 'compose' in suites:
+                    add('compose', 'compose_design.py', size, result)
+
+            if 'render' in suites:
+                metrics_file = output_dir / 'render_metrics.json'
+                result = benchmark_command(lambda run: [
+                    args.blender, '--background', str(args.blend), '--python', str(SCRIPT_DIR / 'render_design.py'),
+                    '--', str(args.blend), str(composited), str(output_dir / 'renders'), str(args.render_samples),
+                    '--images-only', '--cameras', DEFAULT_RENDER_CAMERA, '--metrics-file', str(metrics_file)
+                ], args.repeat, metrics_file)
+                add('render', 'render_design.py', size, result)
+
+            if 'export' in suites:
+                metrics_file = output_dir / 'export_metrics.json'
+                result = benchmark_command(lambda run: [
+                    args.blender, '--background', str(args.blend), '--python', str(SCRIPT_DIR / 'export_glb.py'),
+                    '--', str(args.blend), str(composited), str(output_dir / 'model.glb'),
+                    '--metrics-file', str(metrics_file)
+                ], args.repeat, metrics_file)
+                add('export', 'export_glb.py', size, result)
+    except RuntimeError as e:
+        print(f"Error: Benchmark failed: {e}")
+        sys.exit(1)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'version': BENCHMARK_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'pillow': PILLOW_VERSION,
+            'cpu_count': os.cpu_count(),
+            'blender': blender_version(args.blender) if args.blender and ('render' in suites or 'export' in suites) else None,
+            'commit': git_commit()
+        },
+        'config': {
+            'sizes': args.sizes, 'repeat': args.repeat, 'seed': args.seed, 'preset': DEFAULT_PRESET,
+            'fabric_color': DEFAULT_FABRIC_COLOR, 'render_camera': DEFAULT_RENDER_CAMERA,
+            'render_samples': args.render_samples
+        },
+        'results': results,
+        'skipped': skipped
+    }
+
+    regressions = []
+    if baseline:
+        report['comparison'] = compare(results, baseline, args.threshold / 100)
+        print(f"\nAgainst baseline {args.baseline} ({baseline.get('environment', {}).get('commit') or 'unknown commit'}):")
+        for entry in report['comparison']:
+            flag = '  REGRESSION' if entry['regression'] else ''
+            print(f"  {entry['suite']:<9} {entry['name']:<24} {entry['size']:>5}px  "
+                  f"{entry['baseline_median_ms']:>10.1f} -> {entry['median_ms']:>10.1f} ms  "
+                  f"x{entry['ratio']:.2f}{flag}")
+        regressions = [entry for entry in report['comparison'] if entry['regression']]
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport: {args.report}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:g}%")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,63 @@ Composites user-provided designs onto a T-shirt template with predefined positio
 """
 
 import argparse
+import contextlib
+import fcntl
+import hashlib
+import io
+import json
+import os
+import shutil
+import signal
+import socketserver
+import struct
 import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from multiprocessing import shared_memory
 from pathlib import Path
-from PIL import Image
+from PIL import Image, ImageChops, features
+
+
+# Recolored template cache defaults
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3        # On-disk budget (2 GiB)
+DEFAULT_CACHE_MEMORY_BYTES = 512 * 1024 ** 2   # In-process budget (512 MiB)
+CACHE_ENTRY_MAGIC = b'SWTC'
+CACHE_ENTRY_HEADER = struct.Struct('<4sII4s')  # magic, width, height, mode
+
+# Compose result cache defaults
+DEFAULT_RESULT_CACHE_MAX_BYTES = 1024 ** 3     # On-disk budget (1 GiB)
+RESULT_CACHE_VERSION = 1                       # Bump when compositing output changes
+
+# Streaming PNG support for tiled compositing
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}    # color type -> samples per pixel
+DEFAULT_STRIP_HEIGHT = 512
+TILED_AUTO_PIXELS = 8192 * 8192                   # Templates this large are tiled automatically
+
+# Template pyramid levels: each level halves the previous one
+PYRAMID_LEVELS = {'full': 0, 'half': 1, 'quarter': 2, 'eighth': 3}
+
+# Output encoding profiles for save_output
+OUTPUT_PROFILES = {
+    # Pillow default PNG compression (original behaviour)
+    'png': {'format': 'PNG', 'extension': '.png', 'params': {}},
+    # Fastest PNG encode, larger files
+    'fast-png': {'format': 'PNG', 'extension': '.png',
+                 'params': {'compress_level': 1, 'optimize': False}},
+    # Lossless WebP, low effort setting for speed
+    'webp-lossless': {'format': 'WEBP', 'extension': '.webp',
+                      'params': {'lossless': True, 'quality': 25, 'method': 2}},
+    # Lossy previews for the storefront / admin wizard
+    'webp-preview': {'format': 'WEBP', 'extension': '.webp',
+                     'params': {'quality': 80, 'method': 4}},
+    'avif-preview': {'format': 'AVIF', 'extension': '.avif',
+                     'params': {'quality': 60, 'speed': 8}},
+}
 
 
 def parse_color(color_input: str) -> tuple:
@@ -70,34 +124,442 @@ def parse_color(color_input: str) -> tuple:
     sys.exit(1)
 
 
-def load_template(path: Path, fabric_color: tuple = None) -> Image.Image:
+def _threshold_lut(threshold: int, softness: int = 0) -> list:
+    """Build a 256-entry point() table mapping a band value to mask coverage.
+
+    Values above ``threshold`` map to 255. With ``softness`` > 0 the
+    ``softness`` values at and below the threshold ramp linearly down to 0,
+    so anti-aliased seams get partial coverage instead of a hard edge.
+    """
+    lut = []
+    for value in range(256):
+        if value > threshold:
+            lut.append(255)
+        elif softness > 0 and value > threshold - softness:
+            lut.append(round(255 * (value - (threshold - softness)) / (softness + 1)))
+        else:
+            lut.append(0)
+    return lut
+
+
+def recolor_fabric(img: Image.Image, fabric_color: tuple,
+                   threshold: int = 200, softness: int = 0) -> Image.Image:
+    """Replace white fabric pixels with fabric_color using whole-band operations.
+
+    Args:
+        img: RGBA template image
+        fabric_color: RGBA tuple (R, G, B, A); only RGB is applied, alpha is kept
+        threshold: A pixel is fabric when R, G, B and A are all above this value
+        softness: Width of the ramp below threshold used to blend anti-aliased
+            edges (0 = hard threshold, identical to the per-pixel replacement)
+
+    Returns a new image. With softness=0 the output matches the original
+    per-pixel loop byte-for-byte.
+    """
+    lut = _threshold_lut(threshold, softness)
+    bands = [band.point(lut) for band in img.split()]
+
+    # Coverage is the weakest of the four band masks (logical AND when binary)
+    mask = bands[0]
+    for band in bands[1:]:
+        mask = ImageChops.darker(mask, band)
+
+    fabric = Image.new('RGB', img.size, fabric_color[:3])
+    fabric.putalpha(img.getchannel('A'))
+
+    return Image.composite(fabric, img, mask)
+
+
+class TemplateCache:
+    """LRU cache of decoded, recolored templates held in memory and on disk.
+
+    Entries are keyed by template content hash, mtime, fabric RGBA, the
+    recolor threshold/softness and the pyramid level. On disk each entry is a small header followed
+    by the raw pixel bytes, so a hit skips both PNG decode and recolor.
+    Both tiers evict least-recently-used entries once their byte budget is
+    exceeded. Hit/miss counters accumulate in ``stats.json`` in the cache
+    directory so they can be scraped across processes.
+    """
+
+    def __init__(self, cache_dir: Path = None,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 max_memory_bytes: int = DEFAULT_CACHE_MEMORY_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._hashes = {}
+        self._flushed = dict(self.stats)
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def content_hash(self, path: Path) -> tuple:
+        """Return (sha256, mtime_ns) for a template, memoized per file version."""
+        return file_sha256(path, self._hashes)
+
+    def make_key(self, path: Path, fabric_color: tuple = None,
+                 threshold: int = 200, softness: int = 0, level: int = 0) -> str:
+        """Build the cache key for a template/recolor/pyramid level combination."""
+        digest, mtime_ns = self.content_hash(path)
+        color = ','.join(str(c) for c in fabric_color) if fabric_color else 'none'
+        raw = f"{digest}:{mtime_ns}:{color}:{threshold}:{softness}:{level}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Image.Image:
+        """Return the cached image for key, or None on a miss."""
+        img = self._memory.get(key)
+        if img is not None:
+            self._memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return img
+
+        img = self._read_entry(key)
+        if img is not None:
+            self.stats['disk_hits'] += 1
+            self._remember(key, img)
+            return img
+
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, img: Image.Image) -> None:
+        """Store an image in both cache tiers."""
+        self._remember(key, img)
+        self._write_entry(key, img)
+
+    def _remember(self, key: str, img: Image.Image) -> None:
+        size = self._entry_size(img)
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._entry_size(self._memory.pop(key))
+        self._memory[key] = img
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= self._entry_size(evicted)
+
+    @staticmethod
+    def _entry_size(img: Image.Image) -> int:
+        return len(img.mode) * img.width * img.height
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.raw"
+
+    def _read_entry(self, key: str) -> Image.Image:
+        if not self.cache_dir:
+            return None
+        entry = self._entry_path(key)
+        try:
+            with open(entry, 'rb') as f:
+                header = f.read(CACHE_ENTRY_HEADER.size)
+                magic, width, height, mode = CACHE_ENTRY_HEADER.unpack(header)
+                if magic != CACHE_ENTRY_MAGIC:
+                    return None
+                data = f.read()
+            # Touch the entry so disk eviction sees it as recently used
+            os.utime(entry)
+            return Image.frombytes(mode.decode().strip(), (width, height), data)
+        except (OSError, struct.error, ValueError):
+            return None
+
+    def _write_entry(self, key: str, img: Image.Image) -> None:
+        if not self.cache_dir:
+            return
+        header = CACHE_ENTRY_HEADER.pack(CACHE_ENTRY_MAGIC, img.width, img.height,
+                                         img.mode.ljust(4).encode())
+        try:
+            # Write to a temp file and rename so readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header)
+                f.write(img.tobytes())
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            print(f"Warning: Failed to write template cache entry: {e}")
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob('*.raw'):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, entry))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+                self.stats['evictions'] += 1
+            except OSError:
+                pass
+            total -= size
+
+    def flush_stats(self) -> dict:
+        """Add counters since the last flush to stats.json and return the totals."""
+        delta = {k: v - self._flushed[k] for k, v in self.stats.items()}
+        self._flushed = dict(self.stats)
+        if not self.cache_dir:
+            return dict(self.stats)
+        return merge_stats(self.cache_dir, delta)
+
+
+def file_sha256(path: Path, memo: dict) -> tuple:
+    """Return (sha256, mtime_ns) for a file, memoized in memo per file version."""
+    st = os.stat(path)
+    version = (str(path), st.st_mtime_ns, st.st_size)
+    digest = memo.get(version)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        memo[version] = digest
+    return digest, st.st_mtime_ns
+
+
+def merge_stats(cache_dir: Path, delta: dict) -> dict:
+    """Add counter deltas to cache_dir/stats.json under a file lock; return the totals."""
+    stats_path = cache_dir / 'stats.json'
+    with open(cache_dir / 'stats.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            totals = json.loads(stats_path.read_text())
+        except (OSError, ValueError):
+            totals = {}
+        for k, v in delta.items():
+            totals[k] = totals.get(k, 0) + v
+        tmp_path = stats_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(totals, indent=2))
+        os.replace(tmp_path, stats_path)
+    return totals
+
+
+class ResultCache:
+    """Content-addressed store of finished compose outputs.
+
+    Keys hash the template and design bytes together with everything else
+    that affects the output: placement preset, fabric color, recolor
+    settings, resolution, region, output profile and thumbnail sizes. A
+    repeated or retried job is answered by copying the stored files to the
+    requested output path instead of compositing again.
+
+    Each entry is a directory holding the output, its thumbnails and the
+    save report. Entries are assembled under a temporary name and renamed
+    into place, and copied out through a temp file and rename, so concurrent
+    workers never see partial files. Least-recently-used entries are evicted
+    once the store exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._hashes = {}
+        self._flushed = dict(self.stats)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, template_path: Path, design_path: Path, position_preset: dict,
+                 fabric_color: tuple = None, threshold: int = 200, softness: int = 0,
+                 level: int = 0, region: str = 'atlas', profile_name: str = 'png',
+                 thumbnails: list = None) -> str:
+        """Build the content hash for a compose job.
+
+        Raises OSError if the template or design cannot be read.
+        """
+        raw = json.dumps({
+            'version': RESULT_CACHE_VERSION,
+            'template': file_sha256(template_path, self._hashes)[0],
+            'design': file_sha256(design_path, self._hashes)[0],
+            'preset': position_preset,
+            'fabric_color': list(fabric_color) if fabric_color else None,
+            'threshold': threshold,
+            'softness': softness,
+            'level': level,
+            'region': region,
+            'profile': get_output_profile(profile_name),
+            'thumbnails': list(thumbnails or [])
+        }, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def fetch(self, key: str, output_path: Path, profile_name: str = 'png',
+              thumbnails: list = None) -> dict:
+        """Copy a stored result to output_path and return its report, or None on a miss."""
+        entry = self.cache_dir / key
+        output_path = output_path_for(output_path, profile_name)
+        try:
+            report = json.loads((entry / 'report.json').read_text())
+            self._copy_out(entry / 'output', output_path)
+            report['path'] = str(output_path)
+            for max_size, thumb_report in zip(thumbnails or [], report.get('thumbnails', [])):
+                thumb_path = output_path.with_name(f"{output_path.stem}_{max_size}px{output_path.suffix}")
+                self._copy_out(entry / f"thumb_{max_size}", thumb_path)
+                thumb_report['path'] = str(thumb_path)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry)
+        except (OSError, ValueError):
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        report['cached'] = True
+        print(f"Success: Design composited and saved to {output_path}")
+        print(f"  {report['format']} {report['width']}x{report['height']}, "
+              f"{report['bytes'] / 1024:.1f} KB, reused cached result {key[:12]}")
+        return report
+
+    def store(self, key: str, report: dict, thumbnails: list = None) -> None:
+        """Add the files described by a save report to the store under key."""
+        entry = self.cache_dir / key
+        if entry.exists():
+            return
+
+        tmp_dir = None
+        try:
+            tmp_dir = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-'))
+            shutil.copyfile(report['path'], tmp_dir / 'output')
+            for max_size, thumb_report in zip(thumbnails or [], report.get('thumbnails', [])):
+                shutil.copyfile(thumb_report['path'], tmp_dir / f"thumb_{max_size}")
+            (tmp_dir / 'report.json').write_text(json.dumps(report))
+            # Fails if another worker stored the same result first
+            os.rename(tmp_dir, entry)
+        except OSError as e:
+            if tmp_dir:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not entry.exists():
+                print(f"Warning: Failed to write result cache entry: {e}")
+            return
+
+        self.stats['stores'] += 1
+        self._evict()
+
+    def flush_stats(self) -> dict:
+        """Add counters since the last flush to stats.json and return the totals."""
+        delta = {k: v - self._flushed[k] for k, v in self.stats.items()}
+        self._flushed = dict(self.stats)
+        return merge_stats(self.cache_dir, delta)
+
+    @staticmethod
+    def _copy_out(source: Path, dest: Path) -> None:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, dest)
+        except OSError:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            if entry.name.startswith('.') or not entry.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((entry.stat().st_mtime_ns, size, entry))
+            except OSError:
+                continue
+            total += size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            # Rename first so readers see either the whole entry or none of it
+            doomed = self.cache_dir / f".evict-{entry.name}-{os.getpid()}"
+            try:
+                os.rename(entry, doomed)
+                shutil.rmtree(doomed, ignore_errors=True)
+                self.stats['evictions'] += 1
+            except OSError:
+                pass
+            total -= size
+
+
+def get_pyramid_level(resolution: str) -> int:
+    """Return the pyramid level for a resolution name (full, half, quarter, eighth)."""
+    if resolution not in PYRAMID_LEVELS:
+        available = ', '.join(PYRAMID_LEVELS.keys())
+        print(f"Error: Unknown resolution '{resolution}'")
+        print(f"Available resolutions: {available}")
+        sys.exit(1)
+
+    return PYRAMID_LEVELS[resolution]
+
+
+def reduce_to_level(img: Image.Image, level: int) -> Image.Image:
+    """Downscale img by 2**level with successive 2x box reductions."""
+    for _ in range(level):
+        img = img.reduce(2)
+    return img
+
+
+def load_template(path: Path, fabric_color: tuple = None,
+                  threshold: int = 200, softness: int = 0,
+                  cache: TemplateCache = None, level: int = 0) -> Image.Image:
     """Load template and optionally recolor white fabric areas with specified color.
 
     Args:
         path: Path to the template PNG file
         fabric_color: Optional RGBA tuple (R, G, B, A) to replace white fabric areas
+        threshold: Channel value above which a pixel counts as white fabric
+        softness: Soft-edge ramp width for anti-aliased seams (0 = hard edge)
+        cache: Optional TemplateCache; cached images are shared, so callers
+            must not modify the returned image in place
+        level: Pyramid level (0 = full resolution, each level halves the size).
+            Levels are reduced from the recolored full-resolution template; with
+            a cache, every level is stored on the first miss.
 
     The template has white shirt shapes on transparent/black background.
     When fabric_color is specified, white pixels are replaced with the color.
     """
     try:
+        key = None
+        if cache:
+            key = cache.make_key(path, fabric_color, threshold, softness, level)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        if level > 0:
+            full = load_template(path, fabric_color, threshold, softness, cache)
+            if not cache:
+                return reduce_to_level(full, level)
+
+            # Build and cache the whole pyramid so other levels hit next time
+            img = full
+            for pyramid_level in range(1, max(PYRAMID_LEVELS.values()) + 1):
+                img = img.reduce(2)
+                if pyramid_level == level:
+                    requested = img
+                cache.put(cache.make_key(path, fabric_color, threshold, softness, pyramid_level), img)
+            return requested
+
         img = Image.open(path)
         if img.mode != 'RGBA':
             img = img.convert('RGBA')
 
         # If fabric color specified, replace white pixels with the color
         if fabric_color:
-            pixels = img.load()
-            width, height = img.size
-
-            # Replace white/light pixels (shirt fabric) with the specified color
-            for y in range(height):
-                for x in range(width):
-                    r, g, b, a = pixels[x, y]
-                    # If pixel is mostly white (fabric area) and not transparent
-                    if r > 200 and g > 200 and b > 200 and a > 200:
-                        # Replace RGB with fabric color, keep alpha
-                        pixels[x, y] = fabric_color[:3] + (a,)
+            img = recolor_fabric(img, fabric_color, threshold, softness)
+
+        if cache:
+            img.load()
+            cache.put(key, img)
 
         return img
     except FileNotFoundError:
@@ -125,8 +587,11 @@ def load_design(path: Path) -> Image.Image:
 
 def analyze_template(template_img: Image.Image) -> dict:
     """Analyze template to find panel boundaries."""
-    width, height = template_img.size
+    return analyze_template_size(*template_img.size)
 
+
+def analyze_template_size(width: int, height: int) -> dict:
+    """Find panel boundaries for a template of the given size."""
     # Template is divided into 2x2 grid:
     # Top-left: Left sleeve | Top-right: Right sleeve
     # Bottom-left: Front panel | Bottom-right: Back panel
@@ -209,6 +674,88 @@ def get_position_config(position: str, size: str) -> dict:
     return config
 
 
+# Design placement presets (see get_preset_config)
+PRESETS = {
+    # FRONT PANEL PRESETS (chest area)
+    # chest-small: Small zone at very top of chest (yellow in reference)
+    'chest-small': {
+        'panel': 'front_panel',
+        'scale_factor': 0.45,      # 45% of panel width
+        'margin': 0.15,             # 15% margin from edges
+        'vertical_offset': 0.15,    # 15% down from top (high chest)
+        'max_height_factor': 0.25   # Max 25% of panel height
+    },
+    # chest-medium: Medium zone covering chest area (red in reference)
+    'chest-medium': {
+        'panel': 'front_panel',
+        'scale_factor': 0.60,       # 60% of panel width
+        'margin': 0.12,             # 12% margin from edges
+        'vertical_offset': 0.22,    # 22% down from top
+        'max_height_factor': 0.35   # Max 35% of panel height
+    },
+    # chest-large: Large zone covering most of front (dark red in reference)
+    'chest-large': {
+        'panel': 'front_panel',
+        'scale_factor': 0.75,       # 75% of panel width
+        'margin': 0.08,             # 8% margin from edges
+        'vertical_offset': 0.50,    # 50% down (centered vertically)
+        'max_height_factor': 0.80   # Max 80% of panel height
+    },
+
+    # BACK PANEL PRESETS (upper back area)
+    # back-small: Small zone at top of back (light blue in reference)
+    'back-small': {
+        'panel': 'back_panel',
+        'scale_factor': 0.40,       # 40% of panel width
+        'margin': 0.15,             # 15% margin from edges
+        'vertical_offset': 0.12,    # 12% down from top (high back)
+        'max_height_factor': 0.20   # Max 20% of panel height
+    },
+    # back-medium: Medium zone on upper back (blue in reference)
+    'back-medium': {
+        'panel': 'back_panel',
+        'scale_factor': 0.60,       # 60% of panel width
+        'margin': 0.12,             # 12% margin from edges
+        'vertical_offset': 0.30,    # 30% down from top
+        'max_height_factor': 0.35   # Max 35% of panel height
+    },
+    # back-large: Large zone covering upper/mid back (dark blue in reference)
+    'back-large': {
+        'panel': 'back_panel',
+        'scale_factor': 0.70,       # 70% of panel width
+        'margin': 0.10,             # 10% margin from edges
+        'vertical_offset': 0.25,    # 25% down from top
+        'max_height_factor': 0.50   # Max 50% of panel height
+    },
+
+    # BACK PANEL PRESETS (lower back area - new)
+    # back-bottom-small: Small zone at lower back (bright green in reference)
+    'back-bottom-small': {
+        'panel': 'back_panel',
+        'scale_factor': 0.50,       # 50% of panel width
+        'margin': 0.10,             # 10% margin from edges
+        'vertical_offset': 0.80,    # 80% down (lower back)
+        'max_height_factor': 0.25   # Max 25% of panel height
+    },
+    # back-bottom-medium: Medium zone at lower back (medium green in reference)
+    'back-bottom-medium': {
+        'panel': 'back_panel',
+        'scale_factor': 0.60,       # 60% of panel width
+        'margin': 0.10,             # 10% margin from edges
+        'vertical_offset': 0.75,    # 75% down
+        'max_height_factor': 0.35   # Max 35% of panel height
+    },
+    # back-bottom-large: Large zone at lower back (dark green/teal in reference)
+    'back-bottom-large': {
+        'panel': 'back_panel',
+        'scale_factor': 0.65,       # 65% of panel width
+        'margin': 0.08,             # 8% margin from edges
+        'vertical_offset': 0.70,    # 70% down
+        'max_height_factor': 0.45   # Max 45% of panel height
+    }
+}
+
+
 def get_preset_config(preset_name: str) -> dict:
     """Return positioning parameters for preset.
 
@@ -216,93 +763,13 @@ def get_preset_config(preset_name: str) -> dict:
     maintaining aspect ratio. The design is scaled down (never up) to fit
     100% within the preset area without distortion.
     """
-    presets = {
-        # FRONT PANEL PRESETS (chest area)
-        # chest-small: Small zone at very top of chest (yellow in reference)
-        'chest-small': {
-            'panel': 'front_panel',
-            'scale_factor': 0.45,      # 45% of panel width
-            'margin': 0.15,             # 15% margin from edges
-            'vertical_offset': 0.15,    # 15% down from top (high chest)
-            'max_height_factor': 0.25   # Max 25% of panel height
-        },
-        # chest-medium: Medium zone covering chest area (red in reference)
-        'chest-medium': {
-            'panel': 'front_panel',
-            'scale_factor': 0.60,       # 60% of panel width
-            'margin': 0.12,             # 12% margin from edges
-            'vertical_offset': 0.22,    # 22% down from top
-            'max_height_factor': 0.35   # Max 35% of panel height
-        },
-        # chest-large: Large zone covering most of front (dark red in reference)
-        'chest-large': {
-            'panel': 'front_panel',
-            'scale_factor': 0.75,       # 75% of panel width
-            'margin': 0.08,             # 8% margin from edges
-            'vertical_offset': 0.50,    # 50% down (centered vertically)
-            'max_height_factor': 0.80   # Max 80% of panel height
-        },
-
-        # BACK PANEL PRESETS (upper back area)
-        # back-small: Small zone at top of back (light blue in reference)
-        'back-small': {
-            'panel': 'back_panel',
-            'scale_factor': 0.40,       # 40% of panel width
-            'margin': 0.15,             # 15% margin from edges
-            'vertical_offset': 0.12,    # 12% down from top (high back)
-            'max_height_factor': 0.20   # Max 20% of panel height
-        },
-        # back-medium: Medium zone on upper back (blue in reference)
-        'back-medium': {
-            'panel': 'back_panel',
-            'scale_factor': 0.60,       # 60% of panel width
-            'margin': 0.12,             # 12% margin from edges
-            'vertical_offset': 0.30,    # 30% down from top
-            'max_height_factor': 0.35   # Max 35% of panel height
-        },
-        # back-large: Large zone covering upper/mid back (dark blue in reference)
-        'back-large': {
-            'panel': 'back_panel',
-            'scale_factor': 0.70,       # 70% of panel width
-            'margin': 0.10,             # 10% margin from edges
-            'vertical_offset': 0.25,    # 25% down from top
-            'max_height_factor': 0.50   # Max 50% of panel height
-        },
-
-        # BACK PANEL PRESETS (lower back area - new)
-        # back-bottom-small: Small zone at lower back (bright green in reference)
-        'back-bottom-small': {
-            'panel': 'back_panel',
-            'scale_factor': 0.50,       # 50% of panel width
-            'margin': 0.10,             # 10% margin from edges
-            'vertical_offset': 0.80,    # 80% down (lower back)
-            'max_height_factor': 0.25   # Max 25% of panel height
-        },
-        # back-bottom-medium: Medium zone at lower back (medium green in reference)
-        'back-bottom-medium': {
-            'panel': 'back_panel',
-            'scale_factor': 0.60,       # 60% of panel width
-            'margin': 0.10,             # 10% margin from edges
-            'vertical_offset': 0.75,    # 75% down
-            'max_height_factor': 0.35   # Max 35% of panel height
-        },
-        # back-bottom-large: Large zone at lower back (dark green/teal in reference)
-        'back-bottom-large': {
-            'panel': 'back_panel',
-            'scale_factor': 0.65,       # 65% of panel width
-            'margin': 0.08,             # 8% margin from edges
-            'vertical_offset': 0.70,    # 70% down
-            'max_height_factor': 0.45   # Max 45% of panel height
-        }
-    }
-
-    if preset_name not in presets:
-        available = ', '.join(sorted(presets.keys()))
+    if preset_name not in PRESETS:
+        available = ', '.join(sorted(PRESETS.keys()))
         print(f"Error: Unknown preset '{preset_name}'")
         print(f"Available presets: {available}")
         sys.exit(1)
 
-    return presets[preset_name]
+    return dict(PRESETS[preset_name])
 
 
 def scale_design(design_img: Image.Image, target_width: int, target_height: int) -> Image.Image:
@@ -310,9 +777,13 @@ def scale_design(design_img: Image.Image, target_width: int, target_height: int)
     return design_img.resize((int(target_width), int(target_height)), Image.Resampling.LANCZOS)
 
 
-def composite_design(template_img: Image.Image, design_img: Image.Image,
-                    template_analysis: dict, position_preset: dict) -> Image.Image:
-    """Main compositing logic."""
+def calculate_placement(template_analysis: dict, position_preset: dict,
+                        design_size: tuple) -> dict:
+    """Calculate scaled design size and paste position for a preset.
+
+    Returns a dict with the target 'width'/'height' (floats, as passed to
+    scale_design) and the top-left paste position 'x'/'y'.
+    """
     # Get the target panel (e.g., front_panel)
     panel_name = position_preset['panel']
     panel = template_analysis[panel_name]
@@ -332,7 +803,7 @@ def composite_design(template_img: Image.Image, design_img: Image.Image,
     printable_height = printable_y_end - printable_y_start
 
     # Calculate target design dimensions
-    design_width, design_height = design_img.size
+    design_width, design_height = design_size
     design_aspect = design_height / design_width
 
     target_width = printable_width * position_preset['scale_factor']
@@ -348,39 +819,1051 @@ def composite_design(template_img: Image.Image, design_img: Image.Image,
         target_height = max_allowed_height
         target_width = target_height / design_aspect
 
-    # Scale design
-    scaled_design = scale_design(design_img, target_width, target_height)
-
     # Calculate center position
     vertical_offset = position_preset['vertical_offset']
     center_x = printable_x_start + printable_width / 2
     center_y = printable_y_start + printable_height * vertical_offset
 
     # Calculate paste position (top-left corner)
-    paste_x = int(center_x - target_width / 2)
-    paste_y = int(center_y - target_height / 2)
+    return {
+        'width': target_width,
+        'height': target_height,
+        'x': int(center_x - target_width / 2),
+        'y': int(center_y - target_height / 2)
+    }
+
+
+def panel_box(template_analysis: dict, panel_name: str) -> tuple:
+    """Return the (left, upper, right, lower) box of a template panel."""
+    panel = template_analysis[panel_name]
+    return (panel['x_start'], panel['y_start'], panel['x_end'], panel['y_end'])
+
+
+def design_box(placement: dict, scaled_size: tuple, image_size: tuple) -> tuple:
+    """Return the box a pasted design touches, clipped to the image."""
+    left = max(0, placement['x'])
+    upper = max(0, placement['y'])
+    right = min(image_size[0], placement['x'] + scaled_size[0])
+    lower = min(image_size[1], placement['y'] + scaled_size[1])
+    return (left, upper, max(left, right), max(upper, lower))
+
+
+@contextlib.contextmanager
+def preserved_region(img: Image.Image, box: tuple):
+    """Back up one region of img and restore it on exit.
+
+    Lets a shared template be composited in place (in_place=True) and
+    encoded, copying only the pasted rectangle instead of the whole atlas.
+    """
+    backup = img.crop(box)
+    try:
+        yield img
+    finally:
+        img.paste(backup, box[:2])
+
+
+def composite_design(template_img: Image.Image, design_img: Image.Image,
+                    template_analysis: dict, position_preset: dict,
+                    scaled_design: Image.Image = None, region: str = 'atlas',
+                    in_place: bool = False) -> Image.Image:
+    """Main compositing logic.
+
+    scaled_design may be passed to reuse a design already scaled to this
+    preset's placement (e.g. from a warm cache); otherwise it is scaled here.
+
+    region='atlas' returns the full template; region='panel' returns only the
+    preset's panel, copying just that rectangle. With in_place=True the
+    atlas is pasted into template_img directly instead of a full copy; use it
+    when the caller owns the template, or within preserved_region().
+    """
+    placement = calculate_placement(template_analysis, position_preset, design_img.size)
+
+    # Scale design
+    if scaled_design is None:
+        scaled_design = scale_design(design_img, placement['width'], placement['height'])
+
+    if region == 'panel':
+        # Copy only the target panel and paste relative to its origin
+        box = panel_box(template_analysis, position_preset['panel'])
+        output = template_img.crop(box)
+        output.paste(scaled_design, (placement['x'] - box[0], placement['y'] - box[1]), scaled_design)
+        return output
 
     # Create a copy of the template to avoid modifying the original
-    output = template_img.copy()
+    output = template_img if in_place else template_img.copy()
 
     # Composite onto template using alpha channel for proper transparency
-    output.paste(scaled_design, (paste_x, paste_y), scaled_design)
+    output.paste(scaled_design, (placement['x'], placement['y']), scaled_design)
 
     return output
 
 
-def save_output(img: Image.Image, output_path: Path) -> None:
-    """Save final composited image."""
+def get_output_profile(profile_name: str) -> dict:
+    """Return the encoder settings for an output profile."""
+    if profile_name not in OUTPUT_PROFILES:
+        available = ', '.join(OUTPUT_PROFILES.keys())
+        print(f"Error: Unknown output profile '{profile_name}'")
+        print(f"Available output profiles: {available}")
+        sys.exit(1)
+
+    profile = OUTPUT_PROFILES[profile_name]
+    if profile['format'] != 'PNG' and not features.check(profile['format'].lower()):
+        print(f"Error: Output profile '{profile_name}' needs Pillow built with {profile['format']} support")
+        sys.exit(1)
+
+    return profile
+
+
+def output_path_for(output_path: Path, profile_name: str = 'png') -> Path:
+    """Return output_path with the file extension used by the profile.
+
+    The default 'png' profile keeps the caller's path as is (PNG data is
+    written whatever the extension), so callers expecting the exact
+    --output path still find the file.
+    """
+    extension = OUTPUT_PROFILES[profile_name]['extension']
+    if profile_name == 'png' or output_path.suffix.lower() == extension:
+        return output_path
+    return output_path.with_suffix(extension)
+
+
+def _encode(img: Image.Image, path: Path, profile: dict) -> dict:
+    start = time.perf_counter()
+    img.save(path, profile['format'], **profile['params'])
+    return {
+        'path': str(path),
+        'width': img.width,
+        'height': img.height,
+        'bytes': path.stat().st_size,
+        'encode_ms': round((time.perf_counter() - start) * 1000, 2)
+    }
+
+
+def save_output(img: Image.Image, output_path: Path, profile_name: str = 'png',
+                thumbnails: list = None) -> dict:
+    """Save final composited image.
+
+    Args:
+        img: Composited image
+        output_path: Destination; the extension is replaced to match the profile
+        profile_name: Key of OUTPUT_PROFILES (default 'png', Pillow defaults)
+        thumbnails: Optional list of max edge sizes; each writes
+            <name>_<size>px<ext> with the same profile
+
+    Returns a report with the path, format, size in bytes and encode time of
+    the output and each thumbnail.
+    """
+    profile = get_output_profile(profile_name)
+    output_path = output_path_for(output_path, profile_name)
     try:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        img.save(output_path, 'PNG')
+        report = _encode(img, output_path, profile)
+        report['profile'] = profile_name
+        report['format'] = profile['format']
         print(f"Success: Design composited and saved to {output_path}")
+        print(f"  {profile['format']} {report['width']}x{report['height']}, "
+              f"{report['bytes'] / 1024:.1f} KB, encoded in {report['encode_ms']:.0f} ms")
+
+        report['thumbnails'] = []
+        for max_size in thumbnails or []:
+            thumb = img.copy()
+            thumb.thumbnail((max_size, max_size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            thumb_path = output_path.with_name(f"{output_path.stem}_{max_size}px{output_path.suffix}")
+            thumb_report = _encode(thumb, thumb_path, profile)
+            report['thumbnails'].append(thumb_report)
+            print(f"  Thumbnail {thumb_report['width']}x{thumb_report['height']} saved to {thumb_path}, "
+                  f"{thumb_report['bytes'] / 1024:.1f} KB, encoded in {thumb_report['encode_ms']:.0f} ms")
+
+        return report
     except Exception as e:
         print(f"Error: Failed to save output: {e}")
         sys.exit(1)
 
 
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return (struct.pack('>I', len(data)) + chunk_type + data +
+            struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+
+class PngStripReader:
+    """Decode a non-interlaced 8-bit PNG in horizontal strips.
+
+    IDAT data is inflated incrementally and each strip's filtered scanlines
+    are wrapped in a small stored (uncompressed) PNG that Pillow decodes.
+    The previous strip's last row is prepended unfiltered, so Up/Average/
+    Paeth filters in the strip's first row reconstruct exactly. Memory use
+    is bounded by the strip height, not the image height.
+    """
+
+    def __init__(self, path: Path, strip_height: int = DEFAULT_STRIP_HEIGHT):
+        self.strip_height = strip_height
+        self._file = open(path, 'rb')
+        try:
+            if self._file.read(8) != PNG_SIGNATURE:
+                raise ValueError("not a PNG file")
+
+            self._extra_chunks = []
+            length, chunk_type = self._read_chunk_header()
+            if chunk_type != b'IHDR':
+                raise ValueError("missing IHDR chunk")
+            ihdr = self._read_chunk_data(length)
+            (self.width, self.height, depth, self.color_type,
+             _, _, interlace) = struct.unpack('>IIBBBBB', ihdr)
+            if depth != 8 or interlace != 0 or self.color_type not in PNG_CHANNELS:
+                raise ValueError("only non-interlaced 8-bit PNGs can be streamed")
+            self._ihdr_tail = ihdr[8:]
+            self.stride = self.width * PNG_CHANNELS[self.color_type]
+
+            # Keep the chunks Pillow needs to decode pixels, up to the first IDAT
+            while True:
+                length, chunk_type = self._read_chunk_header()
+                if chunk_type == b'IDAT':
+                    self._idat_length = length
+                    break
+                data = self._read_chunk_data(length)
+                if chunk_type in (b'PLTE', b'tRNS'):
+                    self._extra_chunks.append(_png_chunk(chunk_type, data))
+                elif chunk_type == b'IEND':
+                    raise ValueError("no image data")
+        except Exception:
+            self._file.close()
+            raise
+
+    @property
+    def size(self) -> tuple:
+        return (self.width, self.height)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _read_chunk_header(self) -> tuple:
+        header = self._file.read(8)
+        if len(header) < 8:
+            raise ValueError("truncated PNG file")
+        return struct.unpack('>I4s', header)
+
+    def _read_chunk_data(self, length: int) -> bytes:
+        data = self._file.read(length)
+        self._file.read(4)  # CRC
+        return data
+
+    def _idat_pieces(self):
+        length, chunk_type = self._idat_length, b'IDAT'
+        while chunk_type == b'IDAT':
+            remaining = length
+            while remaining:
+                piece = self._file.read(min(remaining, 1024 * 1024))
+                if not piece:
+                    raise ValueError("truncated PNG file")
+                remaining -= len(piece)
+                yield piece
+            self._file.read(4)  # CRC
+            length, chunk_type = self._read_chunk_header()
+
+    def _decode_strip(self, filtered: bytes, rows: int, previous_row: bytes) -> Image.Image:
+        if previous_row is not None:
+            filtered = b'\x00' + previous_row + filtered
+            rows += 1
+
+        ihdr = struct.pack('>II', self.width, rows) + self._ihdr_tail
+        mini_png = (PNG_SIGNATURE + _png_chunk(b'IHDR', ihdr) + b''.join(self._extra_chunks) +
+                    _png_chunk(b'IDAT', zlib.compress(filtered, 0)) + _png_chunk(b'IEND', b''))
+        img = Image.open(io.BytesIO(mini_png))
+        img.load()
+        if previous_row is not None:
+            img = img.crop((0, 1, self.width, rows))
+        return img
+
+    def strips(self):
+        """Yield (top, strip) pairs; strips are in the file's native mode."""
+        inflater = zlib.decompressobj()
+        row_bytes = 1 + self.stride
+        strip_bytes = self.strip_height * row_bytes
+        buffer = bytearray()
+        previous_row = None
+        top = 0
+
+        def take(rows):
+            nonlocal buffer, previous_row, top
+            size = rows * row_bytes
+            strip = self._decode_strip(bytes(buffer[:size]), rows, previous_row)
+            del buffer[:size]
+            previous_row = strip.crop((0, rows - 1, self.width, rows)).tobytes()
+            if len(previous_row) != self.stride:
+                raise ValueError("unsupported PNG pixel layout for streaming")
+            result = (top, strip)
+            top += rows
+            return result
+
+        for piece in self._idat_pieces():
+            while piece:
+                buffer += inflater.decompress(piece, strip_bytes)
+                piece = inflater.unconsumed_tail
+                while len(buffer) >= strip_bytes and top + self.strip_height < self.height:
+                    yield take(self.strip_height)
+        buffer += inflater.flush()
+
+        while top < self.height:
+            rows = min(self.strip_height, self.height - top)
+            if len(buffer) < rows * row_bytes:
+                raise ValueError("truncated PNG image data")
+            yield take(rows)
+
+
+class PngStripWriter:
+    """Write an RGBA PNG incrementally from horizontal strips.
+
+    Rows use the PNG Up filter, computed for a whole strip at once with
+    ImageChops.subtract_modulo against the strip shifted down by one row.
+    The file is written under a temporary name and renamed on close().
+    """
+
+    def __init__(self, path: Path, width: int, height: int, compress_level: int = 6):
+        self.path = path
+        self.width = width
+        self.stride = width * 4
+        self._previous_row = None
+        self._compressor = zlib.compressobj(compress_level)
+        # A sibling temp name (not mkstemp) keeps the usual umask-based permissions
+        self._tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        self._file = open(self._tmp_path, 'wb')
+        ihdr = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+        self._file.write(PNG_SIGNATURE + _png_chunk(b'IHDR', ihdr))
+
+    def write(self, strip: Image.Image) -> None:
+        rows = strip.height
+        above = Image.new('RGBA', strip.size)
+        if self._previous_row is not None:
+            above.paste(self._previous_row, (0, 0))
+        if rows > 1:
+            above.paste(strip.crop((0, 0, self.width, rows - 1)), (0, 1))
+
+        filtered = ImageChops.subtract_modulo(strip, above).tobytes()
+        scanlines = b''.join(b'\x02' + filtered[i:i + self.stride]
+                             for i in range(0, len(filtered), self.stride))
+        self._write_idat(self._compressor.compress(scanlines))
+        self._previous_row = strip.crop((0, rows - 1, self.width, rows))
+
+    def close(self) -> None:
+        self._write_idat(self._compressor.flush())
+        self._file.write(_png_chunk(b'IEND', b''))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+    def _write_idat(self, data: bytes) -> None:
+        if data:
+            self._file.write(_png_chunk(b'IDAT', data))
+
+
+def streamable_template_size(path: Path) -> tuple:
+    """Return (width, height) if PngStripReader can stream the template, else None."""
+    try:
+        reader = PngStripReader(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    reader.close()
+    return reader.size
+
+
+def composite_tiled(template_path: Path, design_img: Image.Image, position_preset: dict,
+                    output_path: Path, fabric_color: tuple = None,
+                    threshold: int = 200, softness: int = 0,
+                    strip_height: int = DEFAULT_STRIP_HEIGHT,
+                    profile_name: str = 'png') -> dict:
+    """Recolor, composite and write a PNG strip by strip.
+
+    Produces the same pixels as load_template + composite_design +
+    save_output without holding the full template in memory: peak memory is
+    a few strips plus the scaled design. Only the PNG output profiles are
+    supported. Returns a report like save_output.
+    """
+    start = time.perf_counter()
+    profile = get_output_profile(profile_name)
+    output_path = output_path_for(output_path, profile_name)
+    try:
+        reader = PngStripReader(template_path, strip_height)
+    except FileNotFoundError:
+        print(f"Error: Template file not found: {template_path}")
+        sys.exit(1)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Error: Failed to load template: {e}")
+        sys.exit(1)
+
+    template_analysis = analyze_template_size(*reader.size)
+    placement = calculate_placement(template_analysis, position_preset, design_img.size)
+    scaled_design = scale_design(design_img, placement['width'], placement['height'])
+    design_top = placement['y']
+    design_bottom = placement['y'] + scaled_design.height
+
+    writer = None
+    strips = 0
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        writer = PngStripWriter(output_path, reader.width, reader.height,
+                                profile['params'].get('compress_level', 6))
+        for top, strip in reader.strips():
+            if strip.mode != 'RGBA':
+                strip = strip.convert('RGBA')
+            if fabric_color:
+                strip = recolor_fabric(strip, fabric_color, threshold, softness)
+            if design_top < top + strip.height and design_bottom > top:
+                strip.paste(scaled_design, (placement['x'], design_top - top), scaled_design)
+            writer.write(strip)
+            strips += 1
+        writer.close()
+    except Exception as e:
+        if writer:
+            writer.abort()
+        print(f"Error: Failed to composite tiled output: {e}")
+        sys.exit(1)
+    finally:
+        reader.close()
+
+    report = {
+        'path': str(output_path),
+        'width': reader.width,
+        'height': reader.height,
+        'bytes': output_path.stat().st_size,
+        'strips': strips,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        'profile': profile_name,
+        'format': profile['format']
+    }
+    print(f"Success: Design composited and saved to {output_path}")
+    print(f"  PNG {reader.width}x{reader.height}, {report['bytes'] / 1024:.1f} KB, "
+          f"{strips} strips of {strip_height} rows in {report['elapsed_ms']:.0f} ms")
+    return report
+
+
+def color_label(color_input: str) -> str:
+    """Return a filename-safe label for a fabric color argument."""
+    if not color_input:
+        return 'default'
+    return color_input.lstrip('#').lower()
+
+
+def recolored_templates(template_path: Path, fabric_colors: list,
+                        threshold: int = 200, softness: int = 0,
+                        cache: TemplateCache = None, level: int = 0):
+    """Yield (color_input, template) for each fabric color.
+
+    The template is decoded once and recolored once per color, or fetched
+    from the cache when one is given. A falsy color yields the template as-is.
+    Templates are reduced to the given pyramid level after recoloring.
+    """
+    parsed_colors = [(c, parse_color(c) if c else None) for c in fabric_colors]
+    base_template = None
+
+    for color_input, fabric_color in parsed_colors:
+        if cache:
+            yield color_input, load_template(template_path, fabric_color, threshold, softness,
+                                             cache, level)
+            continue
+
+        if base_template is None:
+            base_template = load_template(template_path)
+        template = base_template
+        if fabric_color:
+            template = recolor_fabric(base_template, fabric_color, threshold, softness)
+        yield color_input, reduce_to_level(template, level)
+
+
+def batch_compose(template_path: Path, design_path: Path, preset_names: list,
+                  fabric_colors: list, output_dir: Path,
+                  threshold: int = 200, softness: int = 0,
+                  cache: TemplateCache = None, jobs: int = 1,
+                  profile_name: str = 'png', thumbnails: list = None,
+                  region: str = 'atlas', level: int = 0) -> list:
+    """Composite one design onto every preset for every fabric color.
+
+    The design is decoded once and scaled once per preset; each scaled
+    design is reused for every color. The template is decoded once and
+    recolored once per color (via the cache when given). Outputs are named
+    <design>_<preset>_<color> with the output profile's extension.
+
+    With jobs > 1, encoding runs on a thread pool while the next composite
+    is prepared; at most ``jobs`` composites are held waiting to be encoded.
+    With jobs == 1, atlas outputs are pasted into the template in place and
+    only the design rectangle is backed up and restored.
+
+    Returns the list of written output paths.
+    """
+    design = load_design(design_path)
+    design_name = design_path.stem
+    configs = {name: get_preset_config(name) for name in preset_names}
+    extension = get_output_profile(profile_name)['extension']
+
+    template_analysis = None
+    scaled = {}
+    outputs = []
+    pending = set()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        for color_input, template in recolored_templates(template_path, fabric_colors,
+                                                         threshold, softness, cache, level):
+            if template_analysis is None:
+                template_analysis = analyze_template(template)
+
+            for name, config in configs.items():
+                if name not in scaled:
+                    placement = calculate_placement(template_analysis, config, design.size)
+                    scaled[name] = scale_design(design, placement['width'], placement['height'])
+
+                output_path = output_dir / f"{design_name}_{name}_{color_label(color_input)}{extension}"
+
+                if jobs > 1:
+                    output = composite_design(template, design, template_analysis, config,
+                                              scaled[name], region)
+                    if len(pending) >= jobs:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(save_output, output, output_path,
+                                                profile_name, thumbnails))
+                elif region == 'panel':
+                    output = composite_design(template, design, template_analysis, config,
+                                              scaled[name], region)
+                    save_output(output, output_path, profile_name, thumbnails)
+                else:
+                    placement = calculate_placement(template_analysis, config, design.size)
+                    box = design_box(placement, scaled[name].size, template.size)
+                    with preserved_region(template, box):
+                        output = composite_design(template, design, template_analysis, config,
+                                                  scaled[name], in_place=True)
+                        save_output(output, output_path, profile_name, thumbnails)
+                outputs.append(output_path)
+
+        for future in pending:
+            future.result()
+
+    return outputs
+
+
+def _lru_put(cache: OrderedDict, key, value, max_entries: int) -> None:
+    """Insert into an OrderedDict used as an LRU, evicting the oldest entries."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_entries:
+        cache.popitem(last=False)
+
+
+# Per-process state for ComposePool workers
+_POOL_TEMPLATES = {}
+_POOL_DESIGNS = OrderedDict()
+_POOL_SCALED = OrderedDict()
+
+
+def _pool_init(blocks: dict) -> None:
+    """Attach a pool worker to the shared-memory templates (zero-copy views)."""
+    for key, (name, size) in blocks.items():
+        shm = shared_memory.SharedMemory(name=name)
+        img = Image.frombuffer('RGBA', size, shm.buf, 'raw', 'RGBA', 0, 1)
+        _POOL_TEMPLATES[key] = (shm, img, analyze_template(img))
+
+
+def _pool_compose(job: dict) -> dict:
+    """Composite one job inside a pool worker."""
+    def compose():
+        _, template, template_analysis = _POOL_TEMPLATES[job['template_key']]
+        position_config = get_preset_config(job['preset'])
+
+        design_path = Path(job['design'])
+        design = _POOL_DESIGNS.get(job['design'])
+        if design is None:
+            design = load_design(design_path)
+            design.load()
+        _lru_put(_POOL_DESIGNS, job['design'], design, 8)
+
+        placement = calculate_placement(template_analysis, position_config, design.size)
+        size = (int(placement['width']), int(placement['height']))
+        scaled_key = (job['design'], size)
+        scaled_design = _POOL_SCALED.get(scaled_key)
+        if scaled_design is None:
+            scaled_design = scale_design(design, *size)
+        _lru_put(_POOL_SCALED, scaled_key, scaled_design, 32)
+
+        # Shared templates are read-only views, so atlas output is always a copy
+        output = composite_design(template, design, template_analysis,
+                                  position_config, scaled_design, job.get('region', 'atlas'))
+        return save_output(output, Path(job['output']),
+                           job.get('profile', 'png'), job.get('thumbnails'))
+
+    start = time.perf_counter()
+    # The parent reports results, so only the error line is kept
+    report, error = run_captured(compose, forward_output=False)
+    result = {'id': job.get('id'), 'success': error is None,
+              'duration_ms': round((time.perf_counter() - start) * 1000, 2)}
+    if report:
+        result['output'] = report['path']
+        result['report'] = report
+    if error:
+        result['error'] = error
+    return result
+
+
+class ComposePool:
+    """Process pool for compose jobs sharing decoded templates via shared memory.
+
+    Each template is copied once into a multiprocessing.shared_memory block;
+    workers wrap it with Image.frombuffer instead of holding their own RGBA
+    copy. Decoded and scaled designs are cached per worker process.
+
+    Use as a context manager so the shared memory is always unlinked.
+    """
+
+    def __init__(self, templates: dict, workers: int = None):
+        """
+        Args:
+            templates: Mapping of template key to RGBA image
+            workers: Number of worker processes (default: CPU count)
+        """
+        self._blocks = []
+        blocks = {}
+        try:
+            for key, img in templates.items():
+                if img.mode != 'RGBA':
+                    img = img.convert('RGBA')
+                data = img.tobytes()
+                shm = shared_memory.SharedMemory(create=True, size=len(data))
+                self._blocks.append(shm)
+                shm.buf[:len(data)] = data
+                blocks[key] = (shm.name, img.size)
+        except Exception:
+            self._release()
+            raise
+
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                            initializer=_pool_init, initargs=(blocks,))
+
+    def run(self, jobs: list):
+        """Submit jobs and yield result dicts in completion order.
+
+        Each job is a dict with 'template_key', 'design', 'preset' and
+        'output', plus optional 'profile', 'thumbnails', 'region' and an 'id'
+        echoed back in the result.
+        """
+        futures = [self.executor.submit(_pool_compose, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self._release()
+
+    def _release(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def pool_compose(template_path: Path, design_path: Path, preset_names: list,
+                 fabric_colors: list, output_dir: Path,
+                 threshold: int = 200, softness: int = 0,
+                 cache: TemplateCache = None, workers: int = None,
+                 profile_name: str = 'png', thumbnails: list = None,
+                 region: str = 'atlas', level: int = 0):
+    """Batch compose on a ComposePool; yields result dicts in completion order.
+
+    Templates are recolored once per color in this process and shared with
+    the workers; outputs use the same naming as batch_compose.
+    """
+    for preset_name in preset_names:
+        get_preset_config(preset_name)
+    extension = get_output_profile(profile_name)['extension']
+
+    templates = {}
+    for color_input, template in recolored_templates(template_path, fabric_colors,
+                                                     threshold, softness, cache, level):
+        templates[color_label(color_input)] = template
+
+    design_name = design_path.stem
+    jobs = [{'template_key': key, 'design': str(design_path), 'preset': name,
+             'output': str(output_dir / f"{design_name}_{name}_{key}{extension}"),
+             'profile': profile_name, 'thumbnails': thumbnails, 'region': region}
+            for key in templates for name in preset_names]
+
+    with ComposePool(templates, workers) as pool:
+        # Workers hold views of the shared blocks; drop our private copies
+        templates.clear()
+        yield from pool.run(jobs)
+
+
+def run_captured(fn, *args, forward_output: bool = True):
+    """Run a job function, capturing its stdout and turning failures into errors.
+
+    The CLI helpers report problems by printing "Error: ..." and calling
+    sys.exit(1). For long-lived workers the captured output is forwarded to
+    stderr (unless forward_output is False) and the last "Error:" line is
+    returned instead of exiting.
+
+    Returns (result, error) where error is None on success.
+    """
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            return fn(*args), None
+    except SystemExit:
+        errors = [line for line in log.getvalue().splitlines() if line.startswith('Error:')]
+        return None, errors[-1] if errors else 'Error: Composition failed'
+    except Exception as e:
+        return None, f"Error: {e}"
+    finally:
+        if forward_output:
+            sys.stderr.write(log.getvalue())
+            sys.stderr.flush()
+
+
+class ComposeWorker:
+    """Long-lived compositor that keeps templates and designs warm between jobs.
+
+    Used by --serve. Recolored templates live in a TemplateCache; decoded
+    designs and their scaled variants are kept in small LRUs keyed by file
+    version and target size. With a ResultCache, compose jobs whose inputs
+    and parameters match a stored result are answered from it. Job output
+    that the one-shot CLI prints to stdout is captured per job by run_captured.
+    """
+
+    def __init__(self, template_cache: TemplateCache,
+                 max_designs: int = 32, max_scaled: int = 64,
+                 result_cache: ResultCache = None):
+        self.template_cache = template_cache
+        self.result_cache = result_cache
+        self.max_designs = max_designs
+        self.max_scaled = max_scaled
+        self.jobs = 0
+        self.failures = 0
+        self._designs = OrderedDict()
+        self._scaled = OrderedDict()
+        self._lock = threading.Lock()
+
+    def handle(self, request: dict) -> dict:
+        """Handle one request and return the JSON-serializable response."""
+        command = request.get('command', 'compose')
+        response = {'id': request.get('id')}
+
+        if command == 'ping':
+            response['success'] = True
+            return response
+
+        if command == 'stats':
+            with self._lock:
+                response['success'] = True
+                response['stats'] = {
+                    'jobs': self.jobs,
+                    'failures': self.failures,
+                    'template_cache': dict(self.template_cache.stats),
+                    'result_cache': dict(self.result_cache.stats) if self.result_cache else None,
+                    'designs_cached': len(self._designs),
+                    'scaled_cached': len(self._scaled)
+                }
+            return response
+
+        if command not in ('compose', 'batch'):
+            response['success'] = False
+            response['error'] = f"Unknown command '{command}'"
+            return response
+
+        with self._lock:
+            start = time.perf_counter()
+            if command == 'batch':
+                outputs, error = run_captured(self._batch, request)
+                response['outputs'] = outputs
+            else:
+                report, error = run_captured(self._compose, request)
+                response['output'] = report['path'] if report else None
+                response['report'] = report
+            response['success'] = error is None
+            if error:
+                response['error'] = error
+
+            self.jobs += 1
+            if not response['success']:
+                self.failures += 1
+            if self.template_cache.cache_dir:
+                self.template_cache.flush_stats()
+            if self.result_cache:
+                self.result_cache.flush_stats()
+            response['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+        return response
+
+    def _compose(self, request: dict) -> dict:
+        for field in ('template', 'design', 'output'):
+            if not request.get(field):
+                print(f"Error: Missing required field '{field}'")
+                sys.exit(1)
+
+        if request.get('preset'):
+            position_config = get_preset_config(request['preset'])
+        elif request.get('position'):
+            position_config = get_position_config(request['position'], request.get('size', 'large'))
+        else:
+            print("Error: Either 'preset' or 'position' must be specified")
+            sys.exit(1)
+
+        fabric_color = None
+        if request.get('fabric_color'):
+            fabric_color = parse_color(request['fabric_color'])
+
+        template_path = Path(request['template'])
+        design_path = Path(request['design'])
+        threshold, softness = self._fabric_options(request)
+        level = get_pyramid_level(request.get('resolution', 'full'))
+        region = request.get('region', 'atlas')
+        output_path = Path(request['output'])
+        profile_name = request.get('output_profile', 'png')
+        thumbnails = request.get('thumbnails')
+
+        result_key = None
+        if self.result_cache:
+            try:
+                result_key = self.result_cache.make_key(template_path, design_path, position_config,
+                                                        fabric_color, threshold, softness, level,
+                                                        region, profile_name, thumbnails)
+            except OSError:
+                pass
+        if result_key:
+            report = self.result_cache.fetch(result_key, output_path, profile_name, thumbnails)
+            if report:
+                return report
+
+        template = load_template(template_path, fabric_color, threshold, softness,
+                                 self.template_cache, level)
+        design, design_key = self._load_design(design_path)
+
+        template_analysis = analyze_template(template)
+        placement = calculate_placement(template_analysis, position_config, design.size)
+        scaled_design = self._scaled_design(design, design_key, placement)
+
+        if region == 'panel':
+            output = composite_design(template, design, template_analysis,
+                                      position_config, scaled_design, 'panel')
+            report = save_output(output, output_path, profile_name, thumbnails)
+        else:
+            # Paste into the warm template and restore just the design rectangle
+            box = design_box(placement, scaled_design.size, template.size)
+            with preserved_region(template, box):
+                output = composite_design(template, design, template_analysis,
+                                          position_config, scaled_design, in_place=True)
+                report = save_output(output, output_path, profile_name, thumbnails)
+
+        if result_key:
+            self.result_cache.store(result_key, report, thumbnails)
+        return report
+
+    def _batch(self, request: dict) -> list:
+        for field in ('template', 'design', 'output_dir'):
+            if not request.get(field):
+                print(f"Error: Missing required field '{field}'")
+                sys.exit(1)
+
+        preset_names = request.get('presets') or list(PRESETS.keys())
+        fabric_colors = request.get('fabric_colors') or [request.get('fabric_color')]
+        threshold, softness = self._fabric_options(request)
+
+        outputs = batch_compose(Path(request['template']), Path(request['design']),
+                                preset_names, fabric_colors, Path(request['output_dir']),
+                                threshold, softness,
+                                self.template_cache, int(request.get('jobs', 1)),
+                                request.get('output_profile', 'png'), request.get('thumbnails'),
+                                request.get('region', 'atlas'),
+                                get_pyramid_level(request.get('resolution', 'full')))
+        return [str(path) for path in outputs]
+
+    def _fabric_options(self, request: dict) -> tuple:
+        """Return the request's fabric threshold and softness, checked like the CLI options."""
+        threshold = int(request.get('fabric_threshold', 200))
+        softness = int(request.get('fabric_softness', 0))
+        if not 0 <= threshold <= 255:
+            print("Error: 'fabric_threshold' must be between 0 and 255")
+            sys.exit(1)
+        if not 0 <= softness <= threshold:
+            print("Error: 'fabric_softness' must be between 0 and 'fabric_threshold'")
+            sys.exit(1)
+        return threshold, softness
+
+    def _load_design(self, path: Path) -> tuple:
+        try:
+            st = os.stat(path)
+        except OSError:
+            # Let load_design report the missing file in the usual format
+            return load_design(path), None
+
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        design = self._designs.get(key)
+        if design is None:
+            design = load_design(path)
+            design.load()
+        _lru_put(self._designs, key, design, self.max_designs)
+        return design, key
+
+    def _scaled_design(self, design: Image.Image, design_key: tuple,
+                       placement: dict) -> Image.Image:
+        size = (int(placement['width']), int(placement['height']))
+        if design_key is None:
+            return scale_design(design, *size)
+
+        key = (design_key, size)
+        scaled = self._scaled.get(key)
+        if scaled is None:
+            scaled = scale_design(design, *size)
+        _lru_put(self._scaled, key, scaled, self.max_scaled)
+        return scaled
+
+
+def serve_stream(worker: ComposeWorker, lines, write) -> None:
+    """Answer newline-delimited JSON requests from lines, one response per line."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {'id': None, 'success': False, 'error': f"Error: Invalid JSON request: {e}"}
+        else:
+            if isinstance(request, dict):
+                response = worker.handle(request)
+            else:
+                response = {'id': None, 'success': False, 'error': 'Error: Request must be a JSON object'}
+        write(json.dumps(response) + '\n')
+
+
+def serve_socket(worker: ComposeWorker, socket_path: Path) -> None:
+    """Serve newline-delimited JSON requests on a Unix domain socket."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def write(text):
+                self.wfile.write(text.encode('utf-8'))
+                self.wfile.flush()
+
+            lines = (raw.decode('utf-8', errors='replace') for raw in self.rfile)
+            serve_stream(worker, lines, write)
+
+    if socket_path.exists():
+        socket_path.unlink()
+
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    server.daemon_threads = True
+    print(f"Compose worker listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
+
+
+def batch(args) -> None:
+    """Run batch mode (--output-dir): every preset on every fabric color."""
+    if not args.template or not args.design:
+        print("Error: Batch mode requires --template and --design")
+        sys.exit(1)
+
+    if args.output or args.position or args.size or args.preset:
+        print("Error: --output-dir cannot be used with --output, --preset, --position or --size")
+        print("Use --presets to choose presets in batch mode")
+        sys.exit(1)
+
+    if args.presets == 'all':
+        preset_names = list(PRESETS.keys())
+    else:
+        preset_names = [p.strip() for p in args.presets.split(',') if p.strip()]
+
+    if args.fabric_colors:
+        fabric_colors = [c.strip() for c in args.fabric_colors.split(',') if c.strip()]
+    else:
+        fabric_colors = [args.fabric_color]
+
+    template_cache = None
+    if args.cache_dir:
+        try:
+            template_cache = TemplateCache(args.cache_dir, args.cache_max_mb * 1024 ** 2)
+        except OSError as e:
+            print(f"Error: Cannot use cache directory {args.cache_dir}: {e}")
+            sys.exit(1)
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        outputs = []
+        failures = 0
+        for result in pool_compose(args.template, args.design, preset_names, fabric_colors,
+                                   args.output_dir, args.fabric_threshold, args.fabric_softness,
+                                   template_cache, args.workers,
+                                   args.output_profile, args.thumbnail, args.region,
+                                   PYRAMID_LEVELS[args.resolution]):
+            if result['success']:
+                outputs.append(result['output'])
+                report = result['report']
+                print(f"Success: Design composited and saved to {result['output']} "
+                      f"({report['bytes'] / 1024:.1f} KB, encoded in {report['encode_ms']:.0f} ms, "
+                      f"job {result['duration_ms']:.0f} ms)")
+            else:
+                failures += 1
+                print(result['error'])
+    else:
+        failures = 0
+        outputs = batch_compose(args.template, args.design, preset_names, fabric_colors,
+                                args.output_dir, args.fabric_threshold, args.fabric_softness,
+                                template_cache, args.jobs,
+                                args.output_profile, args.thumbnail, args.region,
+                                PYRAMID_LEVELS[args.resolution])
+    if template_cache:
+        template_cache.flush_stats()
+
+    elapsed = time.perf_counter() - start
+    print(f"Batch complete: {len(outputs)} outputs "
+          f"({len(preset_names)} presets x {len(fabric_colors)} colors) in {elapsed:.2f}s")
+    if failures:
+        print(f"Error: {failures} batch jobs failed")
+        sys.exit(1)
+
+
+def serve(args) -> None:
+    """Run the long-lived compose worker (--serve)."""
+    try:
+        template_cache = TemplateCache(args.cache_dir, args.cache_max_mb * 1024 ** 2)
+    except OSError as e:
+        print(f"Error: Cannot use cache directory {args.cache_dir}: {e}")
+        sys.exit(1)
+
+    result_cache = None
+    if args.result_cache_dir:
+        try:
+            result_cache = ResultCache(args.result_cache_dir, args.result_cache_max_mb * 1024 ** 2)
+        except OSError as e:
+            print(f"Error: Cannot use result cache directory {args.result_cache_dir}: {e}")
+            sys.exit(1)
+
+    worker = ComposeWorker(template_cache, result_cache=result_cache)
+
+    # Exit cleanly (and remove the socket) when the parent stops the worker
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    if args.socket:
+        serve_socket(worker, args.socket)
+    else:
+        def write(text):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+        serve_stream(worker, sys.stdin, write)
+
+
 def main():
     """Parse args and orchestrate workflow."""
     parser = argparse.ArgumentParser(
@@ -397,6 +1880,13 @@ Examples:
   # Using position only (defaults to large size)
   %(prog)s --template shirt.png --design logo.png --position back --output result.png
 
+  # Long-lived worker: one JSON request per line on stdin, one JSON result per line on stdout
+  %(prog)s --serve --cache-dir /tmp/compose-cache
+  {"id": 1, "template": "shirt.png", "design": "logo.png", "preset": "chest-large", "output": "result.png", "fabric_color": "navy"}
+
+  # Same worker on a Unix socket
+  %(prog)s --serve --socket /tmp/compose.sock
+
 Available presets:
   Front panel (chest area):
     chest-small, chest-medium, chest-large
@@ -415,14 +1905,12 @@ Available sizes:
     parser.add_argument(
         '--template',
         type=Path,
-        required=True,
-        help='Path to template PNG file'
+        help='Path to template PNG file (required unless --serve)'
     )
     parser.add_argument(
         '--design',
         type=Path,
-        required=True,
-        help='Path to input design image'
+        help='Path to input design image (required unless --serve)'
     )
     parser.add_argument(
         '--preset',
@@ -444,8 +1932,7 @@ Available sizes:
     parser.add_argument(
         '--output',
         type=Path,
-        required=True,
-        help='Path for output PNG file'
+        help='Path for output PNG file (required unless --serve)'
     )
     parser.add_argument(
         '-f', '--fabric-color',
@@ -453,6 +1940,126 @@ Available sizes:
         default=None,
         help='Fabric/shirt color as hex (#RRGGBB) or name (white, black, red, yellow, navy, etc.)'
     )
+    parser.add_argument(
+        '--fabric-threshold',
+        type=int,
+        default=200,
+        help='Channel value (0-255) above which template pixels count as white fabric (default: 200)'
+    )
+    parser.add_argument(
+        '--fabric-softness',
+        type=int,
+        default=0,
+        help='Soft-edge ramp width below the threshold for anti-aliased seams (default: 0 = hard edge)'
+    )
+    parser.add_argument(
+        '--resolution',
+        type=str,
+        choices=list(PYRAMID_LEVELS.keys()),
+        default='full',
+        help='Template resolution: full (default), half, quarter or eighth for fast previews'
+    )
+    parser.add_argument(
+        '--region',
+        type=str,
+        choices=['atlas', 'panel'],
+        default='atlas',
+        help="Output the full template atlas (default) or only the preset's panel"
+    )
+    parser.add_argument(
+        '--output-profile',
+        type=str,
+        choices=list(OUTPUT_PROFILES.keys()),
+        default='png',
+        help='Output encoding: png (default), fast-png, webp-lossless, webp-preview, avif-preview. '
+             'Other profiles change the output extension to match the format.'
+    )
+    parser.add_argument(
+        '--thumbnail',
+        type=int,
+        action='append',
+        default=None,
+        metavar='SIZE',
+        help='Also write a thumbnail no larger than SIZE px per side (repeatable)'
+    )
+    parser.add_argument(
+        '--tiled',
+        action='store_true',
+        help='Stream the template in horizontal strips to bound memory use '
+             '(automatic for PNG templates of 8192x8192 pixels or more)'
+    )
+    parser.add_argument(
+        '--strip-height',
+        type=int,
+        default=DEFAULT_STRIP_HEIGHT,
+        help=f'Rows per strip for tiled compositing (default: {DEFAULT_STRIP_HEIGHT})'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=None,
+        help='Directory for the recolored template cache (disabled when omitted)'
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES // (1024 ** 2),
+        help='Maximum on-disk size of the template cache in MB (default: 2048)'
+    )
+    parser.add_argument(
+        '--result-cache-dir',
+        type=Path,
+        default=None,
+        help='Directory for the content-addressed output cache; identical jobs copy the '
+             'stored result instead of compositing (disabled when omitted)'
+    )
+    parser.add_argument(
+        '--result-cache-max-mb',
+        type=int,
+        default=DEFAULT_RESULT_CACHE_MAX_BYTES // (1024 ** 2),
+        help='Maximum on-disk size of the result cache in MB (default: 1024)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=Path,
+        default=None,
+        help='Batch mode: write one output per preset and fabric color to this directory'
+    )
+    parser.add_argument(
+        '--presets',
+        type=str,
+        default='all',
+        help="Batch mode: comma-separated presets or 'all' (default: all)"
+    )
+    parser.add_argument(
+        '--fabric-colors',
+        type=str,
+        default=None,
+        help='Batch mode: comma-separated fabric colors (default: --fabric-color, or template as-is)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Batch mode: number of threads used for PNG encoding (default: 1)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Batch mode: compose in N worker processes sharing templates via shared memory (default: 1)'
+    )
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a long-lived worker reading newline-delimited JSON requests'
+    )
+    parser.add_argument(
+        '--socket',
+        type=Path,
+        default=None,
+        help='With --serve, listen on this Unix socket instead of stdin/stdout'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -461,6 +2068,32 @@ Available sizes:
 
     args = parser.parse_args()
 
+    if not 0 <= args.fabric_threshold <= 255:
+        print("Error: --fabric-threshold must be between 0 and 255")
+        sys.exit(1)
+
+    if not 0 <= args.fabric_softness <= args.fabric_threshold:
+        print("Error: --fabric-softness must be between 0 and --fabric-threshold")
+        sys.exit(1)
+
+    if args.strip_height < 1:
+        print("Error: --strip-height must be at least 1")
+        sys.exit(1)
+
+    if args.serve:
+        return serve(args)
+
+    if args.output_dir:
+        return batch(args)
+
+    missing = [flag for flag, value in (('--template', args.template),
+                                        ('--design', args.design),
+                                        ('--output', args.output)) if not value]
+    if missing:
+        print(f"Error: Missing required arguments: {', '.join(missing)}")
+        parser.print_help()
+        sys.exit(1)
+
     # Validate parameter combinations
     if args.preset and (args.position or args.size):
         print("Error: --preset cannot be used with --position or --size")
@@ -493,10 +2126,69 @@ Available sizes:
         if args.verbose:
             print(f"Using fabric color: {args.fabric_color} -> RGBA{fabric_color}")
 
+    # Identical jobs (including queue retries) reuse the stored output
+    result_cache = None
+    result_key = None
+    if args.result_cache_dir:
+        try:
+            result_cache = ResultCache(args.result_cache_dir, args.result_cache_max_mb * 1024 ** 2)
+        except OSError as e:
+            print(f"Error: Cannot use result cache directory {args.result_cache_dir}: {e}")
+            sys.exit(1)
+        try:
+            result_key = result_cache.make_key(args.template, args.design, position_config,
+                                               fabric_color, args.fabric_threshold,
+                                               args.fabric_softness, PYRAMID_LEVELS[args.resolution],
+                                               args.region, args.output_profile, args.thumbnail)
+        except OSError:
+            # Missing inputs are reported by load_template/load_design below
+            result_cache = None
+    if result_cache:
+        if args.verbose:
+            print(f"Result cache key: {result_key}")
+        report = result_cache.fetch(result_key, args.output, args.output_profile, args.thumbnail)
+        if report:
+            result_cache.flush_stats()
+            return
+
+    # Stream very large templates strip by strip instead of decoding them whole
+    template_size = streamable_template_size(args.template)
+    tiled_options = (args.output_profile in ('png', 'fast-png') and args.resolution == 'full' and
+                     args.region == 'atlas' and not args.thumbnail)
+    if args.tiled and not (template_size and tiled_options):
+        print("Warning: --tiled needs a non-interlaced 8-bit PNG template, a PNG output profile, "
+              "full resolution, atlas region and no thumbnails; compositing in memory")
+    elif template_size and tiled_options and (
+            args.tiled or template_size[0] * template_size[1] >= TILED_AUTO_PIXELS):
+        if args.verbose:
+            print(f"Compositing {template_size[0]}x{template_size[1]} template in strips "
+                  f"of {args.strip_height} rows")
+        design = load_design(args.design)
+        report = composite_tiled(args.template, design, position_config, args.output, fabric_color,
+                                 args.fabric_threshold, args.fabric_softness, args.strip_height,
+                                 args.output_profile)
+        if result_cache:
+            result_cache.store(result_key, report, args.thumbnail)
+            result_cache.flush_stats()
+        return
+
     # Load images
     if args.verbose:
         print(f"Loading template: {args.template}")
-    template = load_template(args.template, fabric_color)
+    template_cache = None
+    if args.cache_dir:
+        try:
+            template_cache = TemplateCache(args.cache_dir, args.cache_max_mb * 1024 ** 2)
+        except OSError as e:
+            print(f"Error: Cannot use cache directory {args.cache_dir}: {e}")
+            sys.exit(1)
+    template = load_template(args.template, fabric_color,
+                             args.fabric_threshold, args.fabric_softness,
+                             template_cache, PYRAMID_LEVELS[args.resolution])
+    if template_cache:
+        totals = template_cache.flush_stats()
+        if args.verbose:
+            print(f"Template cache: {json.dumps(template_cache.stats)} (totals: {json.dumps(totals)})")
 
     if args.verbose:
         print(f"Loading design: {args.design}")
@@ -513,10 +2205,15 @@ Available sizes:
     # Composite design
     if args.verbose:
         print("Compositing design onto template")
-    output = composite_design(template, design, template_analysis, position_config)
+    # The template is not reused after this, so paste into it without a copy
+    output = composite_design(template, design, template_analysis, position_config,
+                              region=args.region, in_place=True)
 
     # Save output
-    save_output(output, args.output)
+    report = save_output(output, args.output, args.output_profile, args.thumbnail)
+    if result_cache:
+        result_cache.store(result_key, report, args.thumbnail)
+        result_cache.flush_stats()
 
 
 if __name__ == '__main__':
@@ -6,6 +6,10 @@
 #   -o, --output FILE         Output GLB file path (default: output/model.glb)
 #   -f, --fabric-color COLOR  Fabric/shirt color (hex #RRGGBB or name: white, black, red, etc.)
 #   --draco                   Enable Draco compression for smaller file size
+#   --web                     Web profile: 2048px WebP textures and Draco compression
+#   --variant NAME=FILE       Add a material variant sharing the geometry (repeatable);
+#                             variant textures are written next to the GLB
+#   --template-cache DIR      Reuse the origin-centered template from DIR across exports
 #   --compose PRESET          Composite design onto template first using preset
 #                             (e.g., chest-large, dead-center-medium, back-small)
 #   -h, --help                Show this help message
@@ -15,6 +19,8 @@
 #   ./export-glb.sh logo.png --compose chest-large               # Composite then export
 #   ./export-glb.sh design.png -o models/shirt.glb --draco       # Custom output with compression
 #   ./export-glb.sh logo.png --compose back-medium -f navy       # Navy shirt with design on back
+#   ./export-glb.sh logo.png --compose chest-large --web         # Small model for mobile viewers
+#   ./export-glb.sh white.png --web --variant navy=navy.png      # One model, two colorways
 
 set -e  # Exit on error
 
@@ -27,6 +33,9 @@ OUTPUT_FILE="output/model.glb"
 COMPOSE_PRESET=""
 FABRIC_COLOR=""
 DRACO_FLAG=""
+WEB_FLAG=""
+VARIANTS=()
+TEMPLATE_CACHE=""
 TEMPLATE="$PROJECT_ROOT/assets/t-shirt-template.png"
 BLEND_FILE="$PROJECT_ROOT/assets/original-blender-template.blend"
 
@@ -35,7 +44,7 @@ DESIGN=""
 while [[ $# -gt 0 ]]; do
     case $1 in
         -h|--help)
-            sed -n '2,16p' "$0" | sed 's/^# \?//'
+            sed -n '2,23p' "$0" | sed 's/^# \?//'
             exit 0
             ;;
         -o|--output)
@@ -50,6 +59,22 @@ while [[ $# -gt 0 ]]; do
             DRACO_FLAG="--draco"
             shift
             ;;
+        --web)
+            WEB_FLAG="--web"
+            shift
+            ;;
+        --variant)
+            if [[ "$2" != *=* ]]; then
+                echo "Error: --variant takes NAME=FILE"
+                exit 1
+            fi
+            VARIANTS+=("$2")
+            shift 2
+            ;;
+        --template-cache)
+            TEMPLATE_CACHE="$2"
+            shift 2
+            ;;
         --compose)
             COMPOSE_PRESET="$2"
             shift 2
@@ -109,12 +134,27 @@ if [ -n "$COMPOSE_PRESET" ]; then
     "${COMPOSE_CMD[@]}"
 
     EXPORT_INPUT="$COMPOSITED"
+
+    # Composite the variant designs with the same preset
+    for i in "${!VARIANTS[@]}"; do
+        VARIANT_NAME="${VARIANTS[$i]%%=*}"
+        VARIANT_DESIGN="${VARIANTS[$i]#*=}"
+        VARIANT_COMPOSITED="${OUTPUT_DIR}/${DESIGN_NAME}_${COMPOSE_PRESET}_${VARIANT_NAME}_composited.png"
+        VARIANT_CMD=(python3 "$SCRIPT_DIR/compose_design.py" --template "$TEMPLATE" --design "$VARIANT_DESIGN" --preset "$COMPOSE_PRESET" --output "$VARIANT_COMPOSITED")
+        if [ -n "$FABRIC_COLOR" ]; then
+            VARIANT_CMD+=(-f "$FABRIC_COLOR")
+        fi
+        "${VARIANT_CMD[@]}"
+        VARIANTS[$i]="${VARIANT_NAME}=${VARIANT_COMPOSITED}"
+    done
     echo ""
 fi
 
 # Export to GLB with Blender
 echo "Exporting to GLB: $OUTPUT_FILE"
-if [ -n "$DRACO_FLAG" ]; then
+if [ -n "$WEB_FLAG" ]; then
+    echo "Web profile: Enabled (WebP textures, Draco compression)"
+elif [ -n "$DRACO_FLAG" ]; then
     echo "Draco compression: Enabled"
 else
     echo "Draco compression: Disabled (use --draco to enable)"
@@ -127,12 +167,32 @@ if [ ! -f "$BLEND_FILE" ]; then
 fi
 
 # Build Blender command
-BLENDER_CMD=(blender --background "$BLEND_FILE" --python "$SCRIPT_DIR/export_glb.py" -- "$BLEND_FILE" "$EXPORT_INPUT" "$OUTPUT_FILE")
+# (with a template cache, Blender starts empty so the prepared template is the only file loaded)
+if [ -n "$TEMPLATE_CACHE" ]; then
+    BLENDER_CMD=(blender --background --python "$SCRIPT_DIR/export_glb.py" -- "$BLEND_FILE" "$EXPORT_INPUT" "$OUTPUT_FILE")
+else
+    BLENDER_CMD=(blender --background "$BLEND_FILE" --python "$SCRIPT_DIR/export_glb.py" -- "$BLEND_FILE" "$EXPORT_INPUT" "$OUTPUT_FILE")
+fi
 
 # Add draco flag if set
 if [ -n "$DRACO_FLAG" ]; then
     BLENDER_CMD+=($DRACO_FLAG)
 fi
 
+# Add web profile flag if set
+if [ -n "$WEB_FLAG" ]; then
+    BLENDER_CMD+=($WEB_FLAG)
+fi
+
+# Add material variants
+for VARIANT in "${VARIANTS[@]}"; do
+    BLENDER_CMD+=(--variant "$VARIANT")
+done
+
+# Add prepared template cache if set
+if [ -n "$TEMPLATE_CACHE" ]; then
+    BLENDER_CMD+=(--template-cache "$TEMPLATE_CACHE")
+fi
+
 # Execute Blender command
 "${BLENDER_CMD[@]}"
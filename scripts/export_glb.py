@@ -15,6 +15,29 @@ Arguments:
 Options:
   --draco           Use Draco compression (smaller file size)
   --no-draco        Disable Draco compression (default, better compatibility)
+  --draco-level N   Draco compression level 0-10 (default: 6)
+  --quantize-position N, --quantize-normal N, --quantize-texcoord N,
+  --quantize-color N, --quantize-generic N
+                    Draco quantization bits per attribute (fewer bits = smaller, coarser)
+  --max-texture-size N  Downscale textures so their longest side is at most N pixels
+  --texture-format FORMAT  Embedded texture format: auto (default), jpeg or webp
+                    (webp adds EXT_texture_webp; KTX2 is not supported by Blender)
+  --texture-quality N  JPEG/WebP quality 0-100
+  --max-triangles N Decimate meshes to about N triangles in total
+  --variant NAME=FILE  Add a material variant with another texture (repeatable); the
+                    GLB keeps one copy of the geometry and the variant textures are
+                    written next to it (KHR_materials_variants)
+  --default-variant NAME  Variant name of texture.png (default: default)
+  --web             Web profile: 2048px WebP textures at quality 80, Draco level 7
+                    (explicit options override it)
+  --template-cache DIR  Keep the template with centered mesh origins in DIR, keyed
+                    by the template's content hash, and open it instead of
+                    centering again on later exports
+  --report PATH     Write a JSON report: sizes, triangle counts, timings, validation
+  --metrics         Print a JSON line ({"metric": PHASE, "duration_ms": ...}) for each
+                    phase: Blender startup, template open, origin centering, texture
+                    load and glTF export, with peak RSS
+  --metrics-file PATH  Write all phases, total time and peak RSS as JSON to PATH on exit
 
 Examples:
   # Export with texture applied
@@ -24,44 +47,554 @@ Examples:
   # Export with Draco compression for smaller file size
   blender --background shirt.blend --python export_glb.py -- \
     shirt.blend design.png output/model.glb --draco
+
+  # Mobile storefront model: web profile with a triangle budget and a report
+  blender --background shirt.blend --python export_glb.py -- \
+    shirt.blend design.png output/model.glb --web --max-triangles 50000 --report output/model.json
+
+  # One model for three colorways: model.glb plus model_navy.webp and model_black.webp
+  blender --background shirt.blend --python export_glb.py -- \
+    shirt.blend white.png output/model.glb --web --default-variant white \
+    --variant navy=navy.png --variant black=black.png
+
+Every export is checked with a local glTF validation (GLB container, JSON
+structure, buffer/accessor bounds, image types and extension declarations,
+plus Khronos gltf_validator when it is on PATH); the script exits with an
+error if the output does not pass.
 """
 
+import atexit
 import bpy
+import copy
+import hashlib
+import json
+import shutil
+import struct
+import subprocess
 import sys
 import os
+import tempfile
+import time
+
+# Helpers shared with render_design.py (Blender does not put this directory on sys.path)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from script_utils import file_hash, get_option, metrics, process_age_ms  # noqa: E402
+
+
+# Embedded texture formats by --texture-format name (glTF exporter values)
+TEXTURE_FORMATS = {
+    'auto': 'AUTO',
+    'jpeg': 'JPEG',
+    'webp': 'WEBP'
+}
+
+# Draco quantization settings by attribute (export_draco_<name>_quantization)
+DRACO_QUANTIZATION = ('position', 'normal', 'texcoord', 'color', 'generic')
+
+# --web defaults for mobile storefront viewers
+WEB_PROFILE = {
+    'use_draco': True,
+    'draco_level': 7,
+    'max_texture_size': 2048,
+    'texture_format': 'webp',
+    'texture_quality': 80
+}
+
+# Bump when center_mesh_origins changes what prepared templates contain
+PREPARED_TEMPLATE_VERSION = 1
+
+# Variant texture file extensions and Blender file formats by glTF mimeType
+VARIANT_IMAGE_FORMATS = {
+    'image/png': ('.png', 'PNG'),
+    'image/jpeg': ('.jpg', 'JPEG'),
+    'image/webp': ('.webp', 'WEBP')
+}
+
+# glTF component sizes and element counts, for accessor bounds checks
+COMPONENT_SIZES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+TYPE_COMPONENTS = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT2': 4, 'MAT3': 9, 'MAT4': 16}
+IMAGE_SIGNATURES = {
+    'image/png': lambda data: data[:8] == b'\x89PNG\r\n\x1a\n',
+    'image/jpeg': lambda data: data[:2] == b'\xff\xd8',
+    'image/webp': lambda data: data[:4] == b'RIFF' and data[8:12] == b'WEBP'
+}
+
+
+def count_triangles(evaluated=False):
+    """Return the triangle count of all meshes, optionally after their modifiers."""
+    depsgraph = bpy.context.evaluated_depsgraph_get() if evaluated else None
+    total = 0
+    for obj in bpy.data.objects:
+        if obj.type != 'MESH':
+            continue
+        if evaluated:
+            owner = obj.evaluated_get(depsgraph)
+            mesh = owner.to_mesh()
+        else:
+            mesh = obj.data
+        try:
+            mesh.calc_loop_triangles()
+            total += len(mesh.loop_triangles)
+        finally:
+            if evaluated:
+                owner.to_mesh_clear()
+    return total
+
+
+def decimate_meshes(ratio):
+    """Add a collapse Decimate modifier keeping ratio of the faces to every mesh."""
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH':
+            modifier = obj.modifiers.new(name="WebDecimate", type='DECIMATE')
+            modifier.decimate_type = 'COLLAPSE'
+            modifier.ratio = ratio
+            modifier.use_collapse_triangulate = True
 
 
-def export_glb(blend_file, texture_path, output_path, use_draco=False):
+def downscale_textures(max_size, work_dir):
+    """Scale material textures larger than max_size down and save them to work_dir.
+
+    The exporter then embeds the scaled files. Returns a list of
+    (image name, original size, new size) for the scaled images.
     """
-    Export Blender scene to GLB format with texture applied.
+    images = {}
+    for mat in bpy.data.materials:
+        if mat.use_nodes:
+            for node in mat.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image is not None:
+                    images[node.image.name] = node.image
+
+    scaled = []
+    for name, image in images.items():
+        width, height = image.size
+        if max(width, height) <= max_size:
+            continue
+        factor = max_size / max(width, height)
+        size = (max(1, round(width * factor)), max(1, round(height * factor)))
+        image.scale(*size)
+        image.filepath_raw = os.path.join(work_dir, f"{len(scaled)}_{bpy.path.clean_name(name)}.png")
+        image.file_format = 'PNG'
+        image.save()
+        scaled.append((name, (width, height), size))
+        print(f"Downscaled texture '{name}': {width}x{height} -> {size[0]}x{size[1]}")
+    return scaled
+
+
+def validate_glb(path):
+    """Check a GLB file's container, JSON structure and binary references.
+
+    Covers the header and chunks, asset version, declared extensions,
+    buffer view, accessor and image bounds, image types and index
+    references. Runs the Khronos gltf_validator as well when it is on PATH.
+
+    Returns a list of issues (empty when the file is valid).
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < 20 or data[:4] != b'glTF':
+        return ["Not a GLB file (bad magic)"]
+
+    issues = []
+    version, length = struct.unpack_from('<II', data, 4)
+    if version != 2:
+        issues.append(f"GLB version is {version}, expected 2")
+    if length != len(data):
+        issues.append(f"GLB header length {length} does not match file size {len(data)}")
+
+    chunks = []
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_length, chunk_type = struct.unpack_from('<II', data, offset)
+        if chunk_length % 4:
+            issues.append(f"Chunk at byte {offset} is not 4-byte aligned")
+        chunks.append((chunk_type, data[offset + 8:offset + 8 + chunk_length]))
+        offset += 8 + chunk_length
+    if offset != len(data):
+        issues.append("GLB chunks do not end at the end of the file")
+    if not chunks or chunks[0][0] != 0x4E4F534A:
+        return issues + ["First GLB chunk is not JSON"]
+    try:
+        gltf = json.loads(chunks[0][1].decode('utf-8'))
+    except ValueError as e:
+        return issues + [f"Invalid glTF JSON: {e}"]
+    binary = chunks[1][1] if len(chunks) > 1 and chunks[1][0] == 0x004E4942 else b''
+
+    if gltf.get('asset', {}).get('version') != '2.0':
+        issues.append("asset.version is not '2.0'")
+    used = set(gltf.get('extensionsUsed', []))
+    for extension in gltf.get('extensionsRequired', []):
+        if extension not in used:
+            issues.append(f"Required extension {extension} is not in extensionsUsed")
+
+    def check_index(kind, index, where):
+        if not isinstance(index, int) or not 0 <= index < len(gltf.get(kind, [])):
+            issues.append(f"{where} references missing {kind} {index}")
+            return False
+        return True
+
+    buffers = gltf.get('buffers', [])
+    for i, buffer in enumerate(buffers):
+        if 'uri' not in buffer and buffer.get('byteLength', 0) > len(binary):
+            issues.append(f"buffers[{i}] is longer than the GLB binary chunk")
+
+    views = gltf.get('bufferViews', [])
+    for i, view in enumerate(views):
+        if check_index('buffers', view.get('buffer'), f"bufferViews[{i}]"):
+            end = view.get('byteOffset', 0) + view.get('byteLength', 0)
+            if end > buffers[view['buffer']].get('byteLength', 0):
+                issues.append(f"bufferViews[{i}] ends past its buffer")
+
+    for i, accessor in enumerate(gltf.get('accessors', [])):
+        if accessor.get('count', 0) < 1:
+            issues.append(f"accessors[{i}] has no elements")
+        if 'bufferView' not in accessor:
+            continue
+        if check_index('bufferViews', accessor['bufferView'], f"accessors[{i}]"):
+            view = views[accessor['bufferView']]
+            size = (COMPONENT_SIZES.get(accessor.get('componentType'), 0) *
+                    TYPE_COMPONENTS.get(accessor.get('type'), 0))
+            if not size:
+                issues.append(f"accessors[{i}] has an invalid componentType or type")
+                continue
+            end = (accessor.get('byteOffset', 0) + view.get('byteStride', size) *
+                   (accessor.get('count', 1) - 1) + size)
+            if end > view.get('byteLength', 0):
+                issues.append(f"accessors[{i}] reads past its bufferView")
+
+    for i, image in enumerate(gltf.get('images', [])):
+        mime_type = image.get('mimeType')
+        if mime_type == 'image/webp' and 'EXT_texture_webp' not in used:
+            issues.append(f"images[{i}] is WebP but EXT_texture_webp is not declared")
+        uri = image.get('uri', '')
+        if uri and not uri.startswith('data:') and not os.path.exists(
+                os.path.join(os.path.dirname(os.path.abspath(path)), uri)):
+            issues.append(f"images[{i}] file {uri} does not exist")
+        if 'bufferView' in image and check_index('bufferViews', image['bufferView'], f"images[{i}]"):
+            view = views[image['bufferView']]
+            start = view.get('byteOffset', 0)
+            content = binary[start:start + view.get('byteLength', 0)]
+            if mime_type not in IMAGE_SIGNATURES:
+                issues.append(f"images[{i}] has unsupported mimeType {mime_type}")
+            elif not IMAGE_SIGNATURES[mime_type](content):
+                issues.append(f"images[{i}] content does not match mimeType {mime_type}")
+
+    for i, texture in enumerate(gltf.get('textures', [])):
+        if 'source' in texture:
+            check_index('images', texture['source'], f"textures[{i}]")
+        for name, extension in texture.get('extensions', {}).items():
+            if 'source' in extension:
+                check_index('images', extension['source'], f"textures[{i}].{name}")
+
+    for i, mesh in enumerate(gltf.get('meshes', [])):
+        for j, primitive in enumerate(mesh.get('primitives', [])):
+            where = f"meshes[{i}].primitives[{j}]"
+            for attribute, index in primitive.get('attributes', {}).items():
+                check_index('accessors', index, f"{where}.{attribute}")
+            if 'indices' in primitive:
+                check_index('accessors', primitive['indices'], where)
+            if 'material' in primitive:
+                check_index('materials', primitive['material'], where)
+            draco = primitive.get('extensions', {}).get('KHR_draco_mesh_compression')
+            if draco:
+                check_index('bufferViews', draco.get('bufferView'), f"{where} Draco")
+                if 'KHR_draco_mesh_compression' not in gltf.get('extensionsRequired', []):
+                    issues.append(f"{where} is Draco compressed but the extension is not required")
+            variants = primitive.get('extensions', {}).get('KHR_materials_variants')
+            if variants:
+                if 'KHR_materials_variants' not in used:
+                    issues.append(f"{where} has material variants but KHR_materials_variants is not declared")
+                count = len(gltf.get('extensions', {}).get('KHR_materials_variants', {}).get('variants', []))
+                for mapping in variants.get('mappings', []):
+                    check_index('materials', mapping.get('material'), f"{where} variant mapping")
+                    if any(not isinstance(v, int) or not 0 <= v < count for v in mapping.get('variants', [])):
+                        issues.append(f"{where} maps a missing material variant")
+
+    for i, node in enumerate(gltf.get('nodes', [])):
+        if 'mesh' in node:
+            check_index('meshes', node['mesh'], f"nodes[{i}]")
+        for child in node.get('children', []):
+            check_index('nodes', child, f"nodes[{i}]")
+    for i, scene in enumerate(gltf.get('scenes', [])):
+        for node in scene.get('nodes', []):
+            check_index('nodes', node, f"scenes[{i}]")
+
+    # Full Khronos validation when the CLI is installed
+    validator = shutil.which('gltf_validator')
+    if validator:
+        result = subprocess.run([validator, '-o', path], capture_output=True, text=True)
+        try:
+            report = json.loads(result.stdout)
+            for message in report.get('issues', {}).get('messages', []):
+                if message.get('severity') == 0:
+                    issues.append(f"gltf_validator: {message.get('code')}: {message.get('message')}")
+        except ValueError:
+            issues.append(f"gltf_validator failed: {result.stderr.strip() or result.stdout.strip()}")
+
+    return issues
+
+
+def read_glb(path):
+    """Return the glTF JSON and binary chunk of a GLB file.
+
+    Raises ValueError if the file is not a GLB with a JSON chunk.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < 20 or data[:4] != b'glTF':
+        raise ValueError(f"{path} is not a GLB file")
+    json_length, chunk_type = struct.unpack_from('<II', data, 12)
+    if chunk_type != 0x4E4F534A:
+        raise ValueError(f"First GLB chunk of {path} is not JSON")
+    gltf = json.loads(data[20:20 + json_length].decode('utf-8'))
+
+    binary = b''
+    offset = 20 + json_length
+    if offset + 8 <= len(data):
+        binary_length, chunk_type = struct.unpack_from('<II', data, offset)
+        if chunk_type == 0x004E4942:
+            binary = data[offset + 8:offset + 8 + binary_length]
+    return gltf, binary
+
+
+def write_glb(path, gltf, binary):
+    """Write glTF JSON and a binary chunk to a GLB file, padding both chunks to 4 bytes."""
+    content = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    content += b' ' * (-len(content) % 4)
+    binary += b'\0' * (-len(binary) % 4)
+    length = 12 + 8 + len(content) + (8 + len(binary) if binary else 0)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<4sII', b'glTF', 2, length))
+        f.write(struct.pack('<II', len(content), 0x4E4F534A) + content)
+        if binary:
+            f.write(struct.pack('<II', len(binary), 0x004E4942) + binary)
+
+
+def design_material_names():
+    """Return the names of the materials whose 'Image Texture' node takes the design texture."""
+    return [mat.name for mat in bpy.data.materials
+            if mat.use_nodes and any(node.type == 'TEX_IMAGE' and node.name == 'Image Texture'
+                                     for node in mat.node_tree.nodes)]
+
+
+def save_variant_texture(texture_path, output_path, mime_type, max_size=None, quality=None):
+    """Save a variant texture in the format of the embedded texture, scaled to max_size."""
+    image = bpy.data.images.load(texture_path)
+    try:
+        width, height = image.size
+        if max_size and max(width, height) > max_size:
+            factor = max_size / max(width, height)
+            image.scale(max(1, round(width * factor)), max(1, round(height * factor)))
+        image.filepath_raw = output_path
+        image.file_format = VARIANT_IMAGE_FORMATS[mime_type][1]
+        if quality is not None:
+            image.save(quality=quality)
+        else:
+            image.save()
+    finally:
+        bpy.data.images.remove(image)
+    return os.path.getsize(output_path)
+
+
+def add_material_variants(glb_path, variants, default_variant='default', max_texture_size=None,
+                          texture_quality=None):
+    """Add KHR_materials_variants with per-variant texture files to an exported GLB.
+
+    The exported materials become the default variant. Each other variant
+    gets copies of the design materials whose base color textures are
+    image files next to the GLB, so viewers download the geometry once and
+    fetch a texture per variant they show.
 
     Args:
-        blend_file: Path to .blend template
-        texture_path: Path to texture image
-        output_path: Output GLB file path
-        use_draco: Whether to use Draco compression (default False for better compatibility)
-    """
-    # Load the blend file
-    bpy.ops.wm.open_mainfile(filepath=blend_file)
+        glb_path: Exported GLB file, rewritten in place
+        variants: List of (name, texture path) pairs
+        default_variant: Variant name of the embedded texture
+        max_texture_size: Optional longest texture side in pixels
+        texture_quality: Optional JPEG/WebP quality 0-100
 
+    Returns a list of variant dicts (name, texture, files, size_bytes).
+    """
+    gltf, binary = read_glb(glb_path)
+    materials = gltf.get('materials', [])
+    textures = gltf.get('textures', [])
+    images = gltf.get('images', [])
+    names = set(design_material_names())
+    design = [i for i, material in enumerate(materials) if material.get('name') in names
+              and 'baseColorTexture' in material.get('pbrMetallicRoughness', {})]
+    if not design:
+        raise ValueError("No exported material has the design texture as base color")
+
+    def sources(texture):
+        # Image of the texture and of extensions such as EXT_texture_webp
+        found = [texture['source']] if 'source' in texture else []
+        return found + [extension['source'] for extension in texture.get('extensions', {}).values()
+                        if 'source' in extension]
+
+    design_textures = sorted({materials[i]['pbrMetallicRoughness']['baseColorTexture']['index'] for i in design})
+    design_images = sorted({index for texture in design_textures for index in sources(textures[texture])})
+    directory = os.path.dirname(os.path.abspath(glb_path))
+    stem = os.path.splitext(os.path.basename(glb_path))[0]
+
+    result = [{'name': default_variant, 'texture': None, 'files': [], 'size_bytes': 0}]
+    material_maps = []
+    for name, texture_path in variants:
+        entry = {'name': name, 'texture': texture_path, 'files': [], 'size_bytes': 0}
+        image_map = {}
+        for index in design_images:
+            mime_type = images[index].get('mimeType', 'image/png')
+            suffix = f"_{index}" if len(design_images) > 1 else ''
+            filename = f"{stem}_{bpy.path.clean_name(name)}{suffix}{VARIANT_IMAGE_FORMATS[mime_type][0]}"
+            entry['size_bytes'] += save_variant_texture(texture_path, os.path.join(directory, filename),
+                                                        mime_type, max_texture_size, texture_quality)
+            entry['files'].append(filename)
+            image_map[index] = len(images)
+            images.append({'name': f"{images[index].get('name', 'texture')}_{name}",
+                           'uri': filename, 'mimeType': mime_type})
+
+        texture_map = {}
+        for index in design_textures:
+            texture = copy.deepcopy(textures[index])
+            if 'source' in texture:
+                texture['source'] = image_map[texture['source']]
+            for extension in texture.get('extensions', {}).values():
+                if 'source' in extension:
+                    extension['source'] = image_map[extension['source']]
+            texture_map[index] = len(textures)
+            textures.append(texture)
+
+        material_map = {}
+        for index in design:
+            material = copy.deepcopy(materials[index])
+            material['name'] = f"{material.get('name', 'material')} ({name})"
+            base_color = material['pbrMetallicRoughness']['baseColorTexture']
+            base_color['index'] = texture_map[base_color['index']]
+            material_map[index] = len(materials)
+            materials.append(material)
+        material_maps.append(material_map)
+        result.append(entry)
+        print(f"Added variant '{name}': {', '.join(entry['files'])}")
+
+    for mesh in gltf.get('meshes', []):
+        for primitive in mesh.get('primitives', []):
+            material = primitive.get('material')
+            if material not in design:
+                continue
+            mappings = [{'material': material, 'variants': [0]}]
+            mappings += [{'material': material_map[material], 'variants': [number]}
+                         for number, material_map in enumerate(material_maps, 1)]
+            primitive.setdefault('extensions', {})['KHR_materials_variants'] = {'mappings': mappings}
+
+    gltf.setdefault('extensions', {})['KHR_materials_variants'] = {
+        'variants': [{'name': entry['name']} for entry in result]}
+    if 'KHR_materials_variants' not in gltf.setdefault('extensionsUsed', []):
+        gltf['extensionsUsed'].append('KHR_materials_variants')
+    write_glb(glb_path, gltf, binary)
+    return result
+
+
+def center_mesh_origins():
+    """Center every mesh's origin and move it to the world origin."""
     # Center the mesh origin for proper rotation in web viewers
     # This ensures the model rotates around its center, not an offset point
-    for obj in bpy.data.objects:
-        if obj.type == 'MESH':
-            # Select the object
-            bpy.context.view_layer.objects.active = obj
-            obj.select_set(True)
+    with metrics.phase('center_origins'):
+        for obj in bpy.data.objects:
+            if obj.type == 'MESH':
+                # Select the object
+                bpy.context.view_layer.objects.active = obj
+                obj.select_set(True)
 
-            # Set origin to geometry center (mass center)
-            bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_MASS', center='BOUNDS')
+                # Set origin to geometry center (mass center)
+                bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_MASS', center='BOUNDS')
 
-            # Optionally move to world origin for consistent positioning
-            obj.location = (0, 0, 0)
+                # Optionally move to world origin for consistent positioning
+                obj.location = (0, 0, 0)
 
-            print(f"Centered origin for mesh: {obj.name}")
+                print(f"Centered origin for mesh: {obj.name}")
 
-            obj.select_set(False)
+                obj.select_set(False)
 
+
+def template_hash(blend_file, cache_dir):
+    """Return the sha256 of a template, memoized in cache_dir by path, size and mtime.
+
+    The memo only locates a prepared template, so a changed file that kept
+    its size and mtime can at worst reuse a stale entry.
+    """
+    st = os.stat(blend_file)
+    version = {'path': os.path.abspath(blend_file), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    memo_path = os.path.join(cache_dir, hashlib.sha256(version['path'].encode()).hexdigest() + '.hash.json')
+    try:
+        with open(memo_path) as f:
+            memo = json.load(f)
+        if {key: memo.get(key) for key in version} == version:
+            return memo['sha256']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = file_hash(blend_file)
+    tmp_path = f"{memo_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(version, sha256=digest), f)
+        os.replace(tmp_path, memo_path)
+    except OSError as e:
+        print(f"Warning: Failed to save template hash: {e}")
+    return digest
+
+
+def open_template(blend_file, **fields):
+    """Open blend_file unless it is already the unmodified loaded file (from Blender's command line)."""
+    if bpy.data.filepath and os.path.abspath(bpy.data.filepath) == os.path.abspath(blend_file) \
+            and not bpy.data.is_dirty:
+        return
+    with metrics.phase('open_mainfile', file=os.path.basename(blend_file), **fields):
+        bpy.ops.wm.open_mainfile(filepath=blend_file)
+
+
+def open_prepared_template(blend_file, cache_dir=None):
+    """Open blend_file with its mesh origins centered.
+
+    With cache_dir, the centered template is saved there as a .blend
+    named by the hash of the template contents, the Blender version and
+    PREPARED_TEMPLATE_VERSION, and later exports open that file instead
+    of the template, without centering again. Start Blender without the
+    template on its command line to skip loading it at all. A changed
+    template gets a new name, so stale entries are never used (delete
+    them to reclaim space).
+
+    Returns True if the prepared template came from the cache.
+    """
+    if cache_dir:
+        cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        with metrics.phase('template_hash'):
+            raw = json.dumps({'version': PREPARED_TEMPLATE_VERSION, 'blender': list(bpy.app.version),
+                              'blend': template_hash(blend_file, cache_dir)}, sort_keys=True)
+            prepared = os.path.join(cache_dir, hashlib.sha256(raw.encode()).hexdigest() + '.blend')
+        if os.path.exists(prepared):
+            open_template(prepared, prepared=True)
+            print(f"Using prepared template: {prepared}")
+            return True
+
+    open_template(blend_file)
+    center_mesh_origins()
+
+    if cache_dir:
+        # Save a copy through a temporary file so concurrent exports never open a partial one
+        tmp_path = f"{os.path.splitext(prepared)[0]}.{os.getpid()}.tmp.blend"
+        try:
+            with metrics.phase('save_prepared_template'):
+                bpy.ops.wm.save_as_mainfile(filepath=tmp_path, copy=True)
+            os.replace(tmp_path, prepared)
+            print(f"Saved prepared template: {prepared}")
+        except (OSError, RuntimeError) as e:
+            print(f"Warning: Failed to save prepared template: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+    return False
+
+
+def apply_export_texture(texture_path):
+    """Load the texture into every material's 'Image Texture' node, set up for web viewers."""
     # Find and replace base color image texture
     for mat in bpy.data.materials:
         if mat.use_nodes:
@@ -80,7 +613,8 @@ def export_glb(blend_file, texture_path, output_path, use_draco=False):
 
             if tex_node:
                 # Load new image
-                tex_node.image = bpy.data.images.load(texture_path, check_existing=True)
+                with metrics.phase('texture_load', file=os.path.basename(texture_path)):
+                    tex_node.image = bpy.data.images.load(texture_path, check_existing=True)
                 print(f"Loaded texture into material '{mat.name}'")
 
                 # Connect texture alpha to shader alpha for transparency
@@ -106,18 +640,60 @@ def export_glb(blend_file, texture_path, output_path, use_draco=False):
                         if 'Transmission' in bsdf_node.inputs:
                             bsdf_node.inputs['Transmission'].default_value = 0.0
 
+
+def export_loaded(output_path, use_draco=False, draco_level=6, quantization=None, max_texture_size=None,
+                  texture_format='auto', texture_quality=None, max_triangles=None, variants=None,
+                  default_variant='default', report_path=None):
+    """
+    Export the loaded scene, with its texture already applied, to GLB.
+
+    Args:
+        output_path: Output GLB file path
+        use_draco: Whether to use Draco compression (default False for better compatibility)
+        draco_level: Draco compression level 0-10
+        quantization: Optional dict of Draco quantization bits by DRACO_QUANTIZATION name
+        max_texture_size: Optional longest texture side in pixels; larger textures are downscaled
+        texture_format: TEXTURE_FORMATS name for embedded textures
+        texture_quality: Optional JPEG/WebP quality 0-100
+        max_triangles: Optional total triangle budget; meshes above it are decimated
+        variants: Optional list of (name, texture path) material variants sharing the geometry
+        default_variant: Variant name of the applied texture
+        report_path: Optional path for the JSON size/time/validation report
+
+    Returns the report dict.
+    """
     # Ensure output directory exists
     os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
 
+    report = {
+        'output': output_path,
+        'texture_format': texture_format,
+        'draco': {'enabled': use_draco, 'level': draco_level if use_draco else None,
+                  'quantization': quantization or {}}
+    }
+
+    # Mesh decimation to the triangle budget. The exporter then applies every
+    # modifier (subdivision, mirror, ...), so the budget is measured after them.
+    triangles = count_triangles(evaluated=True)
+    decimate = bool(max_triangles and triangles > max_triangles)
+    # Without decimation the exporter writes the base meshes
+    report['triangles'] = {'original': triangles, 'exported': triangles if decimate else count_triangles()}
+    if decimate:
+        with metrics.phase('decimate', triangles=triangles, budget=max_triangles):
+            decimate_meshes(max_triangles / triangles)
+            report['triangles']['exported'] = count_triangles(evaluated=True)
+        print(f"Decimated meshes: {triangles} -> {report['triangles']['exported']} triangles")
+
     # Export settings (Blender 4.5 compatible)
     export_settings = {
         'filepath': output_path,
         'export_format': 'GLB',  # GLB is binary glTF (single file)
         'export_draco_mesh_compression_enable': use_draco,
-        'export_draco_mesh_compression_level': 6 if use_draco else 0,
+        'export_draco_mesh_compression_level': draco_level if use_draco else 0,
         'export_texture_dir': '',  # Embed textures in GLB
         'export_materials': 'EXPORT',
-        'export_image_format': 'AUTO',  # Auto-detect best format
+        'export_image_format': TEXTURE_FORMATS[texture_format],
+        'export_apply': decimate,  # Apply the modifiers, including Decimate
         'export_texcoords': True,
         'export_normals': True,
         'export_tangents': False,
@@ -125,25 +701,133 @@ def export_glb(blend_file, texture_path, output_path, use_draco=False):
         'export_lights': False,   # Don't export lights, use web viewer lighting
         'export_animations': False,  # Static model for now
     }
+    if texture_quality is not None:
+        export_settings['export_image_quality'] = texture_quality
+    if use_draco:
+        for name, bits in (quantization or {}).items():
+            export_settings[f'export_draco_{name}_quantization'] = bits
 
     print(f"\nExporting to GLB format...")
     print(f"Output: {output_path}")
     print(f"Draco compression: {'Enabled' if use_draco else 'Disabled'}")
 
-    # Export to GLB
-    bpy.ops.export_scene.gltf(**export_settings)
+    # Downscaled textures are embedded from a temporary directory
+    work_dir = tempfile.mkdtemp(prefix='export_glb_')
+    try:
+        if max_texture_size:
+            with metrics.phase('downscale_textures', max_size=max_texture_size):
+                scaled = downscale_textures(max_texture_size, work_dir)
+            report['textures'] = [{'name': name, 'original': list(original), 'exported': list(size)}
+                                  for name, original, size in scaled]
+
+        # Export to GLB
+        start = time.perf_counter()
+        with metrics.phase('export', draco=use_draco) as phase:
+            bpy.ops.export_scene.gltf(**export_settings)
+            phase['size_bytes'] = os.path.getsize(output_path)
+        report['export_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Material variants share the exported geometry
+    if variants:
+        with metrics.phase('variants', count=len(variants)):
+            report['variants'] = add_material_variants(output_path, variants, default_variant,
+                                                       max_texture_size, texture_quality)
 
     # Get file size
     file_size = os.path.getsize(output_path)
     file_size_mb = file_size / (1024 * 1024)
+    report['size_bytes'] = file_size
+
+    with metrics.phase('validate'):
+        issues = validate_glb(output_path)
+    report['validation'] = {'valid': not issues, 'issues': issues,
+                            'gltf_validator': bool(shutil.which('gltf_validator'))}
 
     print(f"\n✓ GLB export completed successfully!")
     print(f"  File size: {file_size_mb:.2f} MB")
+    print(f"  Triangles: {report['triangles']['exported']}")
+    print(f"  Export time: {report['export_ms'] / 1000:.2f}s")
+    if variants:
+        variant_bytes = sum(entry['size_bytes'] for entry in report['variants'])
+        print(f"  Variants: {len(report['variants'])} ({variant_bytes / (1024 * 1024):.2f} MB of variant textures)")
     print(f"  Location: {output_path}")
 
+    if report_path:
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"  Report: {report_path}")
+
     if not use_draco and file_size_mb > 5:
         print(f"\n  Tip: Consider using --draco flag to reduce file size for web")
 
+    return report
+
+
+def export_glb(blend_file, texture_path, output_path, use_draco=False, template_cache=None, **options):
+    """
+    Export Blender scene to GLB format with texture applied.
+
+    Args:
+        blend_file: Path to .blend template
+        texture_path: Path to texture image
+        output_path: Output GLB file path
+        use_draco: Whether to use Draco compression (default False for better compatibility)
+        template_cache: Optional directory of prepared (origin-centered) templates
+        options: Optimization and report options of export_loaded
+
+    Returns the report dict.
+    """
+    # Load the blend file with centered mesh origins
+    open_prepared_template(blend_file, template_cache)
+    apply_export_texture(texture_path)
+    return export_loaded(output_path, use_draco, **options)
+
+
+def parse_export_options(args):
+    """Return export_loaded keyword options from command-line args.
+
+    --web fills in the WEB_PROFILE defaults and explicit options override
+    them. Raises ValueError for invalid values.
+    """
+    options = dict(WEB_PROFILE) if '--web' in args else {}
+    if '--draco' in args:
+        options['use_draco'] = True
+    if '--no-draco' in args:
+        options['use_draco'] = False
+    for name, key in (('--draco-level', 'draco_level'), ('--max-texture-size', 'max_texture_size'),
+                      ('--texture-quality', 'texture_quality'), ('--max-triangles', 'max_triangles')):
+        if get_option(args, name) is not None:
+            options[key] = int(get_option(args, name))
+    if get_option(args, '--texture-format'):
+        options['texture_format'] = get_option(args, '--texture-format')
+    if options.get('texture_format', 'auto') not in TEXTURE_FORMATS:
+        raise ValueError(f"Unknown texture format '{options['texture_format']}'. "
+                         f"Available: {', '.join(TEXTURE_FORMATS)}")
+
+    variants = [args[i + 1] for i, arg in enumerate(args[:-1]) if arg == '--variant']
+    for variant in variants:
+        name, _, texture_path = variant.partition('=')
+        if not name or not texture_path:
+            raise ValueError(f"--variant takes NAME=FILE, got '{variant}'")
+        if not os.path.exists(texture_path):
+            raise ValueError(f"Variant texture '{texture_path}' not found")
+        options.setdefault('variants', []).append((name, texture_path))
+    if get_option(args, '--default-variant'):
+        options['default_variant'] = get_option(args, '--default-variant')
+    names = [options.get('default_variant', 'default')] + [name for name, _ in options.get('variants', [])]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Variant names must be unique: {', '.join(names)}")
+
+    quantization = {name: int(get_option(args, f'--quantize-{name}'))
+                    for name in DRACO_QUANTIZATION if get_option(args, f'--quantize-{name}') is not None}
+    if quantization:
+        options['quantization'] = quantization
+        if not options.get('use_draco'):
+            print("Warning: Quantization options only apply with --draco")
+    return options
+
 
 if __name__ == "__main__":
     # Parse arguments: blend file, texture, output path, [flags]
@@ -158,14 +842,36 @@ if __name__ == "__main__":
     texture_path = args[1]
     output_path = args[2]
 
-    # Check for draco flag
-    use_draco = '--draco' in args
+    metrics.script = 'export_glb'
+    metrics_file = get_option(args, '--metrics-file')
+    metrics.enabled = '--metrics' in args or bool(metrics_file)
+    if metrics.enabled:
+        # Startup includes loading the template given on Blender's command line
+        metrics.stream = '--metrics' in args
+        metrics.record('blender_startup', process_age_ms())
+    if metrics_file:
+        atexit.register(metrics.write, metrics_file)
+
+    # Optimization options
+    try:
+        options = parse_export_options(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
     # Export
     try:
-        export_glb(blend_file, texture_path, output_path, use_draco)
+        report = export_glb(blend_file, texture_path, output_path,
+                            template_cache=get_option(args, '--template-cache'),
+                            report_path=get_option(args, '--report'), **options)
     except Exception as e:
         print(f"\nError during export: {e}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
+
+    if report['validation']['issues']:
+        print("\nError: Exported GLB failed validation:")
+        for issue in report['validation']['issues']:
+            print(f"  - {issue}")
+        sys.exit(1)
@@ -12,6 +12,7 @@
 #   --no-animation            Skip animation rendering (same as --images-only)
 #   --compose PRESET          Composite design onto template first using preset
 #                             (e.g., chest-large, dead-center-medium, back-small)
+#   --glb FILE                Also export the GLB model to FILE in the same Blender run
 #   -h, --help                Show this help message
 #
 # Examples:
@@ -23,6 +24,7 @@
 #   ./render-product.sh logo.png --compose back-medium -s 256             # High quality with composition
 #   ./render-product.sh design.png -f black -b white                      # Black shirt, white background
 #   ./render-product.sh logo.png --compose chest-large -f navy -b transparent  # Navy shirt, transparent bg
+#   ./render-product.sh logo.png --compose chest-large --glb output/model.glb  # Renders + web model
 
 set -e  # Exit on error
 
@@ -37,6 +39,7 @@ RENDER_FLAGS=""
 COMPOSE_PRESET=""
 FABRIC_COLOR=""
 BACKGROUND_COLOR=""
+GLB_FILE=""
 TEMPLATE="$PROJECT_ROOT/assets/t-shirt-template.png"
 BLEND_FILE="$PROJECT_ROOT/assets/original-blender-template.blend"
 
@@ -45,7 +48,7 @@ DESIGN=""
 while [[ $# -gt 0 ]]; do
     case $1 in
         -h|--help)
-            sed -n '2,25p' "$0" | sed 's/^# \?//'
+            sed -n '2,27p' "$0" | sed 's/^# \?//'
             exit 0
             ;;
         -o|--output)
@@ -80,6 +83,10 @@ while [[ $# -gt 0 ]]; do
             COMPOSE_PRESET="$2"
             shift 2
             ;;
+        --glb)
+            GLB_FILE="$2"
+            shift 2
+            ;;
         -*)
             echo "Error: Unknown option $1"
             echo "Run with --help for usage"
@@ -183,5 +190,11 @@ if [ -n "$BACKGROUND_COLOR" ]; then
     BLENDER_CMD+=(-b "$BACKGROUND_COLOR")
 fi
 
+# Export the GLB from the same Blender session
+if [ -n "$GLB_FILE" ]; then
+    mkdir -p "$(dirname "$GLB_FILE")"
+    BLENDER_CMD+=(--glb "$GLB_FILE")
+fi
+
 # Execute Blender command
 "${BLENDER_CMD[@]}"
@@ -11,7 +11,7 @@ Arguments:
   template.blend    Path to Blender template file
   texture.png       Path to texture/design image to apply
   output_dir        Output directory for renders
-  samples           Render samples (default: 128, higher = better quality)
+  samples           Render samples (default: 128, or the quality profile's maximum)
 
 Options:
   --images-only           Render still images only (6 angles)
@@ -19,6 +19,62 @@ Options:
   --no-animation          Skip animation (same as --images-only)
   -f, --fabric-color COLOR    Fabric/shirt base color (hex #RRGGBB or name)
   -b, --background-color COLOR Background color for renders (hex, name, or 'transparent')
+  --quality PROFILE       Render quality profile: thumbnail, preview or production
+  --engine ENGINE         cycles (default: the template's engine), or eevee / workbench for
+                          fast previews (needs a GPU or EGL-capable headless setup)
+  --time-budget SECONDS   Stop sampling each camera (and animation frame) after SECONDS
+  --cameras NAMES         Comma-separated cameras to render (e.g. front_0deg,back_180deg)
+  --panel PANEL           Only render the cameras that see front_panel or back_panel
+  --preset NAME           compose_design.py preset of the texture; sets --panel from it
+  --base-texture PATH     The template texture without the design (needs --cache-dir): each
+                          still renders only the region the design changes and pastes it
+                          over a cached render of the blank garment
+  --threads N             Render threads for this process (default: all cores)
+  --workers N|auto        Split still cameras across N Blender processes; 'auto' sizes
+                          workers from core and camera count
+  --benchmark             Time still rendering for every worker split and report the best
+  --chunk-frames N        Render the turntable as N-frame PNG chunks across the workers, then
+                          encode once; finished chunks are kept and skipped on retry
+                          (default chunk size with --workers: 12)
+  --keep-frames           Keep the turntable PNG frames after encoding
+  --cache-dir DIR         Reuse renders from a content-addressed cache: each camera (and
+                          the turntable) is keyed by the .blend and texture content and the
+                          render settings, and is only rendered on a miss
+  --cache-max-mb N        On-disk budget of the render cache (default: 4096)
+  --glb PATH              Also export the textured model to PATH in this Blender session,
+                          after rendering (export_glb.py's export options such as --draco,
+                          --web or --max-texture-size apply; --glb-report PATH writes its report)
+  --metrics               Print a JSON line ({"metric": PHASE, "duration_ms": ...}) for each
+                          phase: Blender startup, template open, texture load, each camera
+                          render, animation and encode, with sample count and peak RSS
+  --metrics-file PATH     Write all phases, total time and peak RSS as JSON to PATH on exit
+
+Quality profiles:
+  thumbnail     25% resolution, adaptive sampling up to 32 samples
+  preview       50% resolution, adaptive sampling up to 64 samples
+  production    Full resolution, adaptive sampling up to 512 samples
+  Without --quality the template's sampling settings are kept and only the
+  sample count (default 128) and denoising are set.
+
+Render server:
+  blender --background [template.blend] --python render_design.py -- --serve [--socket PATH]
+
+  Keeps Blender and the template loaded and renders one job per JSON request line
+  (stdin/stdout, or a Unix socket with --socket). Only the texture is swapped between
+  jobs of the same template, and Cycles keeps scene data between renders. With --metrics
+  or --metrics-file each response also carries the job's phase 'metrics'.
+
+Manifest batch:
+  blender --background template.blend --python render_design.py -- \
+    template.blend --manifest manifest.json [--samples N] [--report report.json] [OPTIONS]
+
+  Renders many designs in one Blender session. The manifest is a JSON list of
+  entries with 'texture' and 'output_dir' and optional 'background_color',
+  'fabric_color', 'samples', 'mode', 'quality', 'engine', 'time_budget', 'cameras',
+  'panel', 'preset', 'base_texture', 'glb' and 'glb_options'; command-line options
+  are the defaults.
+  A failed entry is reported and the batch continues; the exit code is 1 if
+  any entry failed.
 
 Available colors:
   Named: white, black, red, blue, navy, green, dark-green, yellow, orange, purple, pink,
@@ -36,11 +92,141 @@ Examples:
   # Render animation only with navy shirt
   blender --background shirt.blend --python render_design.py -- \
     shirt.blend design.png output/ 256 --animation-only -f navy
+
+  # Quick preview capped at 10 seconds per angle
+  blender --background shirt.blend --python render_design.py -- \
+    shirt.blend design.png output/ --images-only --quality preview --time-budget 10
+
+  # Sub-second-per-angle preview with EEVEE while the Cycles job runs
+  blender --background shirt.blend --python render_design.py -- \
+    shirt.blend design.png output/preview --images-only --engine eevee --quality thumbnail
+
+  # Back print: render the back cameras only, and only where the design is
+  blender --background shirt.blend --python render_design.py -- \
+    shirt.blend design.png output/ --images-only --preset back-large \
+    --base-texture blank_white.png --cache-dir /var/cache/renders
+
+  # Renders and the web model from one Blender start and template load
+  blender --background shirt.blend --python render_design.py -- \
+    shirt.blend design.png output/ --glb output/model.glb --web
+
+  # Stills split across Blender processes sized from the core count
+  blender --background shirt.blend --python render_design.py -- \
+    shirt.blend design.png output/ 128 --workers auto
+
+  # Resumable turntable rendered in 10-frame chunks on 2 workers
+  blender --background shirt.blend --python render_design.py -- \
+    shirt.blend design.png output/ 128 --animation-only --workers 2 --chunk-frames 10
+
+  # Find the fastest worker split for a template
+  blender --background shirt.blend --python render_design.py -- \
+    shirt.blend design.png output/bench 64 --benchmark
+
+  # Render server on a Unix socket, one JSON request per line
+  blender --background shirt.blend --python render_design.py -- --serve --socket /tmp/render.sock
+  {"id": 1, "blend_file": "shirt.blend", "texture": "design.png", "output_dir": "output/", "samples": 64}
 """
 
+import atexit
 import bpy
-import sys
+import hashlib
+import json
+import numpy
 import os
+import shutil
+import signal
+import socketserver
+import subprocess
+import sys
+import time
+
+# Helpers shared with export_glb.py (Blender does not put this directory on sys.path)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from script_utils import file_hash, get_option, metrics, peak_rss_mb, process_age_ms  # noqa: E402
+
+
+# Render quality profiles (see configure_render). 'samples' is the adaptive
+# sampling maximum; sampling stops earlier once noise is below the threshold.
+QUALITY_PROFILES = {
+    'thumbnail': {
+        'samples': 32,
+        'adaptive_min_samples': 8,
+        'adaptive_threshold': 0.1,
+        'denoiser': 'OPENIMAGEDENOISE',
+        'tile_size': 2048,
+        'resolution_percentage': 25
+    },
+    'preview': {
+        'samples': 64,
+        'adaptive_min_samples': 16,
+        'adaptive_threshold': 0.05,
+        'denoiser': 'OPENIMAGEDENOISE',
+        'tile_size': 2048,
+        'resolution_percentage': 50
+    },
+    'production': {
+        'samples': 512,
+        'adaptive_min_samples': 64,
+        'adaptive_threshold': 0.01,
+        'denoiser': 'OPENIMAGEDENOISE',
+        'tile_size': 2048,
+        'resolution_percentage': 100
+    }
+}
+
+# Cycles CPU rendering scales poorly past this many threads per process, so
+# automatic worker sizing gives each Blender worker at least this many
+MIN_WORKER_THREADS = 4
+
+# Render cache defaults
+DEFAULT_RENDER_CACHE_MAX_BYTES = 4 * 1024 ** 3   # On-disk budget (4 GiB)
+RENDER_CACHE_VERSION = 1                         # Bump when render output changes
+
+# Turntable frames per chunk when the animation is split across workers
+DEFAULT_CHUNK_FRAMES = 12
+
+# Worker options that change the rendered frames, and so the turntable resume
+# fingerprint; others (cache and metrics options) only affect reporting and reuse
+OUTPUT_RENDER_OPTIONS = ('--quality', '--time-budget', '--engine', '-f', '-b', '--cameras')
+VALUELESS_RENDER_OPTIONS = ('--metrics',)
+
+# Camera angle prefix of the cameras that see each texture panel (see compose_design.py)
+PANEL_CAMERAS = {
+    'front_panel': 'front',
+    'back_panel': 'back'
+}
+
+# Region-of-interest renders: padding around the projected design box (fraction
+# of the frame) and pixels at the border edge left to the base render
+ROI_PADDING = 0.02
+ROI_SEAM_PIXELS = 2
+
+# Render engines by --engine name; EEVEE is 'BLENDER_EEVEE_NEXT' in Blender 4.2-4.x
+RENDER_ENGINES = {
+    'cycles': ('CYCLES',),
+    'eevee': ('BLENDER_EEVEE_NEXT', 'BLENDER_EEVEE'),
+    'workbench': ('BLENDER_WORKBENCH',)
+}
+PREVIEW_ENGINE_SAMPLES = 16   # Default EEVEE samples when none are given
+
+# Scene settings a job may change; RenderWorker restores them between jobs
+TUNED_SETTINGS = [
+    ('render', 'engine'),
+    ('eevee', 'taa_render_samples'),
+    ('display', 'render_aa'),
+    ('display.shading', 'light'),
+    ('display.shading', 'color_type'),
+    ('cycles', 'samples'),
+    ('cycles', 'use_denoising'),
+    ('cycles', 'denoiser'),
+    ('cycles', 'use_adaptive_sampling'),
+    ('cycles', 'adaptive_threshold'),
+    ('cycles', 'adaptive_min_samples'),
+    ('cycles', 'time_limit'),
+    ('cycles', 'tile_size'),
+    ('render', 'resolution_percentage'),
+    ('render', 'film_transparent')
+]
 
 
 def parse_color_to_rgb(color_input: str) -> tuple:
@@ -98,144 +284,1443 @@ def parse_color_to_rgb(color_input: str) -> tuple:
     raise ValueError(f"Unknown color '{color_input}'. Available: {available_colors} or hex #RRGGBB")
 
 
-def replace_texture_and_render(blend_file, texture_path, output_dir, samples=128, render_images=True, render_animation=True, fabric_color=None, background_color=None):
+class RenderCache:
+    """Content-addressed store of rendered camera images and turntables.
+
+    A job key hashes the .blend and texture file contents with the render
+    settings that affect the pixels (samples, quality profile, time budget,
+    resolution, background). Each camera view is stored under the hash of
+    the job key and the camera name, so adding a camera or re-running a job
+    only renders the views that are missing.
+
+    Entries are written to a temporary file and renamed, and copied out the
+    same way, so concurrent renders never see partial files. Least-recently-
+    used entries are evicted once the store exceeds max_bytes.
     """
-    Replace texture in blend file and render image + animation
 
-    Args:
-        blend_file: Path to .blend template
-        texture_path: Path to texture image
-        output_dir: Output directory for renders
-        samples: Number of render samples (default 128, lower = faster)
-        render_images: Whether to render still images from all camera angles (default True)
-        render_animation: Whether to render animation (default True)
-        fabric_color: Optional RGB tuple (0-1 range) for fabric material color
-        background_color: Optional RGB tuple (0-1 range) or None for transparent background
+    def __init__(self, cache_dir, max_bytes=DEFAULT_RENDER_CACHE_MAX_BYTES):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._hashes = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def file_hash(self, path):
+        """Return the sha256 of a file, memoized per file version."""
+        st = os.stat(path)
+        version = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        digest = self._hashes.get(version)
+        if digest is None:
+            digest = file_hash(path)
+            self._hashes[version] = digest
+        return digest
+
+    def job_key(self, blend_file, texture_path, settings):
+        """Build the key shared by every view of one render job."""
+        raw = json.dumps({
+            'version': RENDER_CACHE_VERSION,
+            'blend': self.file_hash(blend_file),
+            'texture': self.file_hash(texture_path),
+            'settings': settings
+        }, sort_keys=True)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def fetch(self, job_key, view, output_path):
+        """Copy a cached view to output_path. Returns True on a hit."""
+        entry = self._entry_path(job_key, view, output_path)
+        try:
+            self._copy(entry, output_path)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry)
+        except OSError:
+            self.stats['misses'] += 1
+            return False
+        self.stats['hits'] += 1
+        return True
+
+    def store(self, job_key, view, output_path):
+        """Add a freshly rendered view to the cache."""
+        try:
+            self._copy(output_path, self._entry_path(job_key, view, output_path))
+        except OSError as e:
+            print(f"Warning: Failed to write render cache entry: {e}")
+            return
+        self.stats['stores'] += 1
+        self._evict()
+
+    def _entry_path(self, job_key, view, output_path):
+        key = hashlib.sha256(f"{job_key}:{view}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + os.path.splitext(output_path)[1])
+
+    @staticmethod
+    def _copy(source, dest):
+        os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+        tmp_path = f"{dest}.{os.getpid()}.tmp"
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, dest)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                self.stats['evictions'] += 1
+            except OSError:
+                pass
+            total -= size
+
+
+def scene_samples(scene):
+    """Return the sample setting of the scene's render engine."""
+    if scene.render.engine == 'CYCLES':
+        return scene.cycles.samples
+    if 'EEVEE' in scene.render.engine:
+        return scene.eevee.taa_render_samples
+    return scene.display.render_aa
+
+
+def render_settings_key(scene, background_color=None, quality=None, time_budget=None):
+    """Return the render settings that affect output pixels, for RenderCache keys."""
+    return {
+        'engine': scene.render.engine,
+        'samples': scene_samples(scene),
+        'quality': quality,
+        'time_budget': time_budget,
+        'resolution': [scene.render.resolution_x, scene.render.resolution_y,
+                       scene.render.resolution_percentage],
+        'background': list(background_color) if background_color else None,
+        'frame': scene.frame_current,
+        'frames': [scene.frame_start, scene.frame_end]
+    }
+
+
+def load_blend(blend_file):
+    """Open the template unless it is already the loaded, unmodified main file.
+
+    Blender has usually loaded the template from the command line already,
+    so re-opening it would only repeat the scene load.
+
+    Returns True if the file was (re)opened.
     """
-    # Load the blend file
-    bpy.ops.wm.open_mainfile(filepath=blend_file)
+    if (bpy.data.filepath and not bpy.data.is_dirty and
+            os.path.abspath(bpy.data.filepath) == os.path.abspath(blend_file)):
+        return False
+    with metrics.phase('open_mainfile', file=os.path.basename(blend_file)):
+        bpy.ops.wm.open_mainfile(filepath=blend_file)
+    return True
+
 
-    # Find and replace base color image texture
+def index_materials():
+    """Return (material, texture node, BSDF node) for each material with an 'Image Texture' node.
+
+    The BSDF node is None when the material has no Principled BSDF.
+    """
+    index = []
     for mat in bpy.data.materials:
         if mat.use_nodes:
-            nodes = mat.node_tree.nodes
-            links = mat.node_tree.links
-
             # Find the base color texture node and BSDF
             tex_node = None
             bsdf_node = None
 
-            for node in nodes:
+            for node in mat.node_tree.nodes:
                 if node.type == 'TEX_IMAGE' and node.name == 'Image Texture':
                     tex_node = node
                 elif node.type == 'BSDF_PRINCIPLED':
                     bsdf_node = node
 
             if tex_node:
-                # Load new image
-                tex_node.image = bpy.data.images.load(texture_path, check_existing=True)
-                print(f"Loaded texture into material '{mat.name}'")
-
-                # IMPORTANT: Connect texture alpha to shader alpha for transparency
-                if bsdf_node and tex_node.outputs.get('Alpha'):
-                    alpha_input = bsdf_node.inputs.get('Alpha')
-                    if alpha_input and not alpha_input.is_linked:
-                        links.new(tex_node.outputs['Alpha'], alpha_input)
-                        print(f"  ✓ Connected texture alpha to shader alpha")
-
-                    # Enable blend mode for proper transparency
-                    mat.blend_method = 'BLEND'
-                    if hasattr(mat, 'shadow_method'):
-                        mat.shadow_method = 'HASHED'
+                index.append((mat, tex_node, bsdf_node))
+    return index
 
-    # Set fabric color if specified (only used when rendering without composed texture)
-    # NOTE: When using --compose with fabric color, the color is already in the texture
-    # This option is for directly rendering a design on colored fabric without pre-composition
-    if fabric_color:
-        print(f"Note: Fabric color specified as RGB{fabric_color}")
-        print("WARNING: When using --compose with -f flag, fabric color is already in the texture.")
-        print("The fabric color parameter in render_design.py is ignored when texture is present.")
-        # We don't override the texture - the color should come from compose_design.py
 
-    # Setup output paths
-    design_name = os.path.splitext(os.path.basename(texture_path))[0]
+def connect_texture_alpha(index):
+    """Connect each indexed texture's alpha to its shader alpha for transparency."""
+    for mat, tex_node, bsdf_node in index:
+        if bsdf_node and tex_node.outputs.get('Alpha'):
+            alpha_input = bsdf_node.inputs.get('Alpha')
+            if alpha_input and not alpha_input.is_linked:
+                mat.node_tree.links.new(tex_node.outputs['Alpha'], alpha_input)
+                print(f"  ✓ Connected texture alpha to shader alpha in '{mat.name}'")
+
+            # Enable blend mode for proper transparency
+            mat.blend_method = 'BLEND'
+            if hasattr(mat, 'shadow_method'):
+                mat.shadow_method = 'HASHED'
+
+
+def apply_texture(texture_path, index=None):
+    """Load the texture into every material's 'Image Texture' node.
+
+    index is a material index from index_materials(); without one the
+    materials are scanned and their alpha connected first.
+
+    Returns the loaded image datablock, or None if no material uses one.
+    """
+    if index is None:
+        index = index_materials()
+        connect_texture_alpha(index)
+
+    image = None
+    for mat, tex_node, _ in index:
+        if image is None:
+            with metrics.phase('texture_load', file=os.path.basename(texture_path)):
+                image = bpy.data.images.load(texture_path, check_existing=True)
+        tex_node.image = image
+        print(f"Loaded texture into material '{mat.name}'")
+
+    return image
+
+
+def find_world_background(scene):
+    """Return the world's Background node, or None."""
+    if scene.world and scene.world.use_nodes:
+        for node in scene.world.node_tree.nodes:
+            if node.type == 'BACKGROUND':
+                return node
+    return None
+
+
+def settings_group(scene, group):
+    """Resolve a dotted TUNED_SETTINGS group such as 'display.shading' on the scene."""
+    target = scene
+    for name in group.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+def set_render_engine(scene, engine):
+    """Switch the scene to a RENDER_ENGINES engine, using the identifier this Blender knows."""
+    for identifier in RENDER_ENGINES[engine]:
+        try:
+            scene.render.engine = identifier
+            return identifier
+        except TypeError:
+            continue
+    raise ValueError(f"Render engine '{engine}' is not available in this Blender version")
+
+
+def configure_render(scene, samples=128, background_color=None, quality=None, time_budget=None, engine=None):
+    """Apply engine, quality, output format and background settings to the scene.
+
+    Args:
+        scene: Scene to configure
+        samples: Sample count; with a quality profile, overrides its maximum when given
+        background_color: Optional RGB tuple (0-1 range) or None for transparent background
+        quality: Optional QUALITY_PROFILES name
+        time_budget: Optional per-render time limit in seconds (Cycles time_limit)
+        engine: Optional RENDER_ENGINES name; the template's engine is kept when omitted
+    """
+    profile = QUALITY_PROFILES[quality] if quality else {}
+
+    if engine:
+        identifier = set_render_engine(scene, engine)
+        print(f"Using render engine {identifier}")
+        if engine == 'eevee':
+            scene.eevee.taa_render_samples = samples or PREVIEW_ENGINE_SAMPLES
+        elif engine == 'workbench':
+            # Show the design texture under studio lighting
+            scene.display.shading.light = 'STUDIO'
+            scene.display.shading.color_type = 'TEXTURE'
+            scene.display.render_aa = '8'
 
     # Optimize render settings
-    scene = bpy.context.scene
-    scene.cycles.samples = samples  # Reduce samples for faster renders
+    scene.cycles.samples = samples or profile.get('samples', 128)  # Reduce samples for faster renders
     scene.cycles.use_denoising = True  # Enable denoising to compensate for lower samples
     scene.render.image_settings.file_format = 'PNG'
 
+    if profile:
+        scene.cycles.use_adaptive_sampling = True
+        scene.cycles.adaptive_threshold = profile['adaptive_threshold']
+        scene.cycles.adaptive_min_samples = min(profile['adaptive_min_samples'], scene.cycles.samples)
+        scene.cycles.denoiser = profile['denoiser']
+        if hasattr(scene.cycles, 'tile_size'):
+            scene.cycles.tile_size = profile['tile_size']
+        scene.render.resolution_percentage = profile['resolution_percentage']
+        print(f"Using quality profile '{quality}': up to {scene.cycles.samples} samples, "
+              f"noise threshold {profile['adaptive_threshold']}, {profile['resolution_percentage']}% resolution")
+
+    if time_budget:
+        # Cycles stops sampling a render once the limit is reached
+        scene.cycles.time_limit = time_budget
+        print(f"Time budget: {time_budget:g}s per render")
+
     # Set background color (world shader)
     if background_color is not None:
         # Enable transparent background or set solid color
         scene.render.film_transparent = False
-        if scene.world and scene.world.use_nodes:
-            # Find Background node and set color
-            for node in scene.world.node_tree.nodes:
-                if node.type == 'BACKGROUND':
-                    node.inputs['Color'].default_value = background_color + (1.0,)  # Add alpha
-                    print(f"Set background color to RGB{background_color}")
-                    break
+        background = find_world_background(scene)
+        if background:
+            background.inputs['Color'].default_value = background_color + (1.0,)  # Add alpha
+            print(f"Set background color to RGB{background_color}")
     else:
         # Use transparent background (default)
         scene.render.film_transparent = True
         print("Using transparent background")
 
-    # Render still images from all camera angles
-    if render_images:
-        cameras = [obj for obj in bpy.data.objects if obj.type == 'CAMERA']
-        print(f"\nRendering {len(cameras)} camera angles...")
 
+def preset_panel(preset):
+    """Return the texture panel a compose_design.py preset or position places the design on."""
+    return 'back_panel' if preset.startswith('back') else 'front_panel'
+
+
+def select_cameras(names=None, panel=None):
+    """Return the scene cameras, optionally limited to names and to the cameras that see a panel.
+
+    Names may be given with or without the 'Camera_' prefix. panel is a
+    PANEL_CAMERAS key; only cameras whose angle starts with its prefix are kept.
+    """
+    cameras = [obj for obj in bpy.data.objects if obj.type == 'CAMERA']
+    if names:
+        by_name = {}
         for camera in cameras:
-            # Set this camera as the active camera
-            scene.camera = camera
+            by_name[camera.name] = camera
+            by_name[camera.name.replace("Camera_", "")] = camera
+        unknown = [name for name in names if name not in by_name]
+        if unknown:
+            available = ', '.join(camera.name.replace("Camera_", "") for camera in cameras)
+            raise ValueError(f"Unknown camera(s): {', '.join(unknown)}. Available: {available}")
+        cameras = [by_name[name] for name in names]
+
+    if panel:
+        if panel not in PANEL_CAMERAS:
+            raise ValueError(f"Unknown panel '{panel}'. Available: {', '.join(PANEL_CAMERAS)}")
+        prefix = PANEL_CAMERAS[panel]
+        cameras = [camera for camera in cameras if camera.name.replace("Camera_", "").startswith(prefix)]
+    return cameras
+
+
+def render_stills(scene, output_dir, design_name, cameras=None, cache=None, cache_key=None):
+    """Render a still image from every camera (or the given ones). Returns the written paths.
+
+    With a RenderCache and job key, cameras already in the cache are copied
+    from it instead of rendered, and new renders are added to it.
+    """
+    if cameras is None:
+        cameras = select_cameras()
+    print(f"\nRendering {len(cameras)} camera angles...")
+
+    outputs = []
+    for camera in cameras:
+        # Set this camera as the active camera
+        scene.camera = camera
+
+        # Extract angle name from camera name
+        angle_name = camera.name.replace("Camera_", "")
+
+        # Render still image
+        scene.render.filepath = os.path.join(output_dir, f"{design_name}_{angle_name}.png")
+        with metrics.phase('render', camera=angle_name, samples=scene_samples(scene)) as phase:
+            if cache and cache.fetch(cache_key, camera.name, scene.render.filepath):
+                phase['cached'] = True
+                print(f"✓ Rendered {angle_name}: {design_name}_{angle_name}.png (cached)")
+            else:
+                bpy.ops.render.render(write_still=True)
+                print(f"✓ Rendered {angle_name}: {design_name}_{angle_name}.png")
+                if cache:
+                    cache.store(cache_key, camera.name, scene.render.filepath)
+        outputs.append(scene.render.filepath)
+
+    return outputs
+
+
+def image_pixels(image):
+    """Return an image's pixels as a (height, width, channels) float32 array, bottom row first."""
+    width, height = image.size
+    pixels = numpy.empty(width * height * image.channels, dtype=numpy.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, image.channels)
+
+
+def texture_change_region(image, base_image):
+    """Return the UV box (u0, v0, u1, v1) where image differs from base_image, or None."""
+    if tuple(image.size) != tuple(base_image.size):
+        raise ValueError("The base texture must be the same size as the texture")
+
+    pixels = image_pixels(image)
+    base = image_pixels(base_image)
+    channels = min(pixels.shape[2], base.shape[2])
+    # Ignore 8-bit rounding differences from re-encoding
+    changed = (numpy.abs(pixels[:, :, :channels] - base[:, :, :channels]) > 1.5 / 255).any(axis=2)
+    rows = numpy.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return None
+    cols = numpy.flatnonzero(changed.any(axis=0))
+
+    width, height = image.size
+    return (cols[0] / width, rows[0] / height, (cols[-1] + 1) / width, (rows[-1] + 1) / height)
+
+
+def camera_region(scene, camera, uv_region):
+    """Return the render border (min_x, min_y, max_x, max_y) that covers uv_region in camera.
+
+    Mesh faces whose UVs overlap uv_region and that face the camera are
+    projected into the frame, and their bounding box is padded by
+    ROI_PADDING. Returns None when no such face is in view.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    render = scene.render
+    camera_matrix = numpy.array(camera.matrix_world)
+    view = numpy.linalg.inv(camera_matrix)
+    projection = numpy.array(camera.calc_matrix_camera(
+        depsgraph, x=render.resolution_x, y=render.resolution_y,
+        scale_x=render.pixel_aspect_x, scale_y=render.pixel_aspect_y))
+    u0, v0, u1, v1 = uv_region
+
+    points = []
+    for obj in bpy.data.objects:
+        if obj.type != 'MESH' or obj.hide_render:
+            continue
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        try:
+            if not mesh.uv_layers.active or not len(mesh.polygons):
+                continue
+            poly_count = len(mesh.polygons)
+
+            # Faces whose UV bounds overlap the changed texture region
+            uvs = numpy.empty(len(mesh.loops) * 2, dtype=numpy.float32)
+            mesh.uv_layers.active.data.foreach_get('uv', uvs)
+            uvs = uvs.reshape(-1, 2)
+            loop_start = numpy.empty(poly_count, dtype=numpy.int32)
+            mesh.polygons.foreach_get('loop_start', loop_start)
+            loop_total = numpy.empty(poly_count, dtype=numpy.int32)
+            mesh.polygons.foreach_get('loop_total', loop_total)
+            selected = ((numpy.minimum.reduceat(uvs[:, 0], loop_start) <= u1) &
+                        (numpy.maximum.reduceat(uvs[:, 0], loop_start) >= u0) &
+                        (numpy.minimum.reduceat(uvs[:, 1], loop_start) <= v1) &
+                        (numpy.maximum.reduceat(uvs[:, 1], loop_start) >= v0))
+
+            # ...that face the camera
+            matrix = numpy.array(evaluated.matrix_world)
+            centers = numpy.empty(poly_count * 3, dtype=numpy.float32)
+            mesh.polygons.foreach_get('center', centers)
+            centers = centers.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+            normals = numpy.empty(poly_count * 3, dtype=numpy.float32)
+            mesh.polygons.foreach_get('normal', normals)
+            normals = normals.reshape(-1, 3) @ numpy.linalg.inv(matrix[:3, :3])
+            if camera.data.type == 'ORTHO':
+                facing = normals @ -camera_matrix[:3, 2] < 0
+            else:
+                facing = ((centers - camera_matrix[:3, 3]) * normals).sum(axis=1) < 0
+            selected &= facing
+            if not selected.any():
+                continue
+
+            # Project their vertices into normalized frame coordinates
+            vertex_index = numpy.empty(len(mesh.loops), dtype=numpy.int32)
+            mesh.loops.foreach_get('vertex_index', vertex_index)
+            vertices = numpy.unique(vertex_index[numpy.repeat(selected, loop_total)])
+            coords = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+            mesh.vertices.foreach_get('co', coords)
+            coords = coords.reshape(-1, 3)[vertices]
+            clip = numpy.c_[coords, numpy.ones(len(coords))] @ (projection @ view @ matrix).T
+            clip = clip[clip[:, 3] > 0]
+            points.append((clip[:, :2] / clip[:, 3:4] + 1) / 2)
+        finally:
+            evaluated.to_mesh_clear()
+
+    if not points:
+        return None
+    points = numpy.concatenate(points)
+    if not len(points):
+        return None
+    min_x, min_y = numpy.clip(points.min(axis=0) - ROI_PADDING, 0, 1)
+    max_x, max_y = numpy.clip(points.max(axis=0) + ROI_PADDING, 0, 1)
+    if min_x >= max_x or min_y >= max_y:
+        return None
+    return (float(min_x), float(min_y), float(max_x), float(max_y))
+
+
+def render_region(scene, border, filepath):
+    """Render only the border box of the frame (uncropped) to filepath."""
+    render = scene.render
+    render.use_border = True
+    render.use_crop_to_border = False
+    render.border_min_x, render.border_min_y, render.border_max_x, render.border_max_y = border
+    render.filepath = filepath
+    try:
+        bpy.ops.render.render(write_still=True)
+    finally:
+        render.use_border = False
+
+
+def paste_region(base_path, region_path, border, output_path):
+    """Write base_path with the border box of region_path pasted over it to output_path."""
+    base = bpy.data.images.load(base_path)
+    region = bpy.data.images.load(region_path)
+    try:
+        pixels = image_pixels(base)
+        patch = image_pixels(region)
+        if patch.shape != pixels.shape:
+            raise ValueError("Region render does not match the base render size")
+
+        # Keep clear of the border edge, where the region render may fade out
+        height, width = pixels.shape[:2]
+        x0 = int(border[0] * width) + ROI_SEAM_PIXELS
+        y0 = int(border[1] * height) + ROI_SEAM_PIXELS
+        x1 = int(border[2] * width) - ROI_SEAM_PIXELS
+        y1 = int(border[3] * height) - ROI_SEAM_PIXELS
+        pixels[y0:y1, x0:x1] = patch[y0:y1, x0:x1]
+
+        result = bpy.data.images.new(os.path.basename(output_path), width, height,
+                                     alpha=True, float_buffer=base.is_float)
+        try:
+            result.colorspace_settings.name = base.colorspace_settings.name
+            result.pixels.foreach_set(pixels.ravel())
+            result.filepath_raw = output_path
+            result.file_format = 'PNG'
+            result.save()
+        finally:
+            bpy.data.images.remove(result)
+    finally:
+        bpy.data.images.remove(base)
+        bpy.data.images.remove(region)
+
+
+def render_stills_over_base(scene, output_dir, design_name, base_texture, cameras, cache, cache_key, base_key):
+    """Render only the part of each still the design changes, over cached blank-garment renders.
+
+    base_texture is the template texture without the design (same fabric
+    color). Each camera's render of it comes from the cache, or is rendered
+    once and stored under base_key. The UV box where the texture differs
+    from base_texture is projected into every camera, only that render
+    border is rendered, and it is pasted over the base render. Cameras that
+    do not see the box get the base render unchanged.
+
+    Returns the written paths.
+    """
+    index = index_materials()
+    if not index:
+        raise ValueError("No 'Image Texture' node found in the template materials")
+    design_image = index[0][1].image
+    print(f"\nRendering {len(cameras)} camera angles over base renders...")
+
+    outputs = []
+    pending = []
+    for camera in cameras:
+        angle_name = camera.name.replace("Camera_", "")
+        output_path = os.path.join(output_dir, f"{design_name}_{angle_name}.png")
+        outputs.append(output_path)
+        if cache.fetch(cache_key, camera.name, output_path):
+            print(f"✓ Rendered {angle_name}: {design_name}_{angle_name}.png (cached)")
+        else:
+            pending.append((camera, angle_name, output_path))
+    if not pending:
+        return outputs
+
+    base_paths = {camera.name: os.path.join(output_dir, f".base_{camera.name}.png") for camera, _, _ in pending}
+    # Always a fresh datablock: base_key hashes the file as it is now, so pixels
+    # of an earlier file at the same path must not be reused
+    base_image = bpy.data.images.load(base_texture, check_existing=False)
+    try:
+        missing = [camera for camera, _, _ in pending
+                   if not cache.fetch(base_key, camera.name, base_paths[camera.name])]
+        if missing:
+            for _, tex_node, _ in index:
+                tex_node.image = base_image
+            try:
+                for camera in missing:
+                    scene.camera = camera
+                    scene.render.filepath = base_paths[camera.name]
+                    with metrics.phase('render_base', camera=camera.name.replace("Camera_", ""),
+                                       samples=scene_samples(scene)):
+                        bpy.ops.render.render(write_still=True)
+                    cache.store(base_key, camera.name, base_paths[camera.name])
+                    print(f"✓ Base render for {camera.name.replace('Camera_', '')}")
+            finally:
+                for _, tex_node, _ in index:
+                    tex_node.image = design_image
+
+        uv_region = texture_change_region(design_image, base_image)
+        for camera, angle_name, output_path in pending:
+            border = camera_region(scene, camera, uv_region) if uv_region else None
+            if border is None:
+                shutil.copyfile(base_paths[camera.name], output_path)
+                print(f"✓ Rendered {angle_name}: {design_name}_{angle_name}.png (design not in view)")
+            else:
+                region_path = os.path.join(output_dir, f".region_{camera.name}.png")
+                scene.camera = camera
+                area = (border[2] - border[0]) * (border[3] - border[1])
+                with metrics.phase('render', camera=angle_name, samples=scene_samples(scene),
+                                   region=round(area, 4)):
+                    render_region(scene, border, region_path)
+                    try:
+                        paste_region(base_paths[camera.name], region_path, border, output_path)
+                    finally:
+                        os.unlink(region_path)
+                print(f"✓ Rendered {angle_name}: {design_name}_{angle_name}.png ({area:.0%} of frame)")
+            cache.store(cache_key, camera.name, output_path)
+    finally:
+        bpy.data.images.remove(base_image)
+        for path in base_paths.values():
+            if os.path.exists(path):
+                os.unlink(path)
+
+    return outputs
+
+
+def render_turntable(scene, output_dir, design_name, cache=None, cache_key=None):
+    """Render the turntable animation from the front camera. Returns the path or None.
+
+    With a RenderCache and job key, a cached turntable is copied instead of rendered.
+    """
+    front_camera = bpy.data.objects.get("Camera_front_0deg")
+    if not front_camera:
+        print("⚠ Warning: Front camera not found, skipping animation")
+        return None
+
+    scene.camera = front_camera
+    scene.render.filepath = os.path.join(output_dir, f"{design_name}_animation")
+    set_movie_output(scene.render)
+    movie_path = scene.render.frame_path(frame=scene.frame_start)
+    if cache and cache.fetch(cache_key, 'turntable', movie_path):
+        print(f"✓ Rendered animation from front camera: {design_name}_animation.mp4 (cached)")
+        return movie_path
+
+    with metrics.phase('animation', frames=scene.frame_end - scene.frame_start + 1,
+                       samples=scene_samples(scene)):
+        bpy.ops.render.render(animation=True)
+    print(f"✓ Rendered animation from front camera: {design_name}_animation.mp4")
+    if cache:
+        cache.store(cache_key, 'turntable', movie_path)
+    return movie_path
+
+
+def set_movie_output(render):
+    """Configure H264/MPEG4 output for turntable animations."""
+    render.image_settings.file_format = 'FFMPEG'
+    render.ffmpeg.format = 'MPEG4'
+    render.ffmpeg.codec = 'H264'
+    render.ffmpeg.constant_rate_factor = 'HIGH'  # Good quality
+    render.ffmpeg.ffmpeg_preset = 'GOOD'
+
+
+def output_render_args(render_args):
+    """Return the samples and OUTPUT_RENDER_OPTIONS (with values) of worker render_args."""
+    render_args = list(render_args)
+    output = []
+    i = 0
+    if render_args and render_args[0].isdigit():
+        output.append(render_args[0])
+        i = 1
+    while i < len(render_args):
+        if render_args[i] in VALUELESS_RENDER_OPTIONS:
+            i += 1
+            continue
+        if render_args[i] in OUTPUT_RENDER_OPTIONS:
+            output += render_args[i:i + 2]
+        i += 2
+    return output
+
+
+def frame_chunks(frame_start, frame_end, chunk_frames):
+    """Split an inclusive frame range into (start, end) chunks."""
+    return [(start, min(start + chunk_frames - 1, frame_end))
+            for start in range(frame_start, frame_end + 1, chunk_frames)]
+
+
+def chunk_marker(frames_dir, chunk):
+    """Path of the file that marks a frame chunk as completely rendered."""
+    return os.path.join(frames_dir, f"chunk_{chunk[0]:04d}-{chunk[1]:04d}.done")
+
+
+def render_frame_chunks(scene, frames_dir, chunks):
+    """Render turntable frame chunks from the front camera to PNG files in frames_dir.
+
+    A marker file is written after each chunk so a retried job can skip it.
+    """
+    front_camera = bpy.data.objects.get("Camera_front_0deg")
+    if not front_camera:
+        raise ValueError("Front camera not found, cannot render animation")
+
+    scene.camera = front_camera
+    scene.render.image_settings.file_format = 'PNG'
+    scene.render.filepath = os.path.join(frames_dir, "frame_####")
+    frame_range = (scene.frame_start, scene.frame_end)
+    try:
+        for chunk in chunks:
+            scene.frame_start, scene.frame_end = chunk
+            with metrics.phase('render_chunk', frames=f"{chunk[0]}-{chunk[1]}", samples=scene_samples(scene)):
+                bpy.ops.render.render(animation=True)
+            with open(chunk_marker(frames_dir, chunk), 'w') as f:
+                f.write('done\n')
+            print(f"✓ Rendered frames {chunk[0]}-{chunk[1]}")
+    finally:
+        scene.frame_start, scene.frame_end = frame_range
+
 
-            # Extract angle name from camera name
-            angle_name = camera.name.replace("Camera_", "")
+def encode_frames(scene, frame_paths, filepath):
+    """Encode a PNG frame sequence to the turntable movie with the sequencer.
 
-            # Render still image
-            scene.render.filepath = os.path.join(output_dir, f"{design_name}_{angle_name}.png")
-            bpy.ops.render.render(write_still=True)
-            print(f"✓ Rendered {angle_name}: {design_name}_{angle_name}.png")
+    Uses a temporary scene with the frames' resolution and the same frame
+    rate and movie settings as a direct animation render. Returns the movie path.
+    """
+    first_frame = bpy.data.images.load(frame_paths[0])
+    width, height = first_frame.size
+    bpy.data.images.remove(first_frame)
+
+    encode_scene = bpy.data.scenes.new("Turntable Encode")
+    try:
+        render = encode_scene.render
+        render.resolution_x = width
+        render.resolution_y = height
+        render.resolution_percentage = 100
+        render.fps = scene.render.fps
+        render.fps_base = scene.render.fps_base
+
+        # The frames are already display-referred; pass them through without tone mapping
+        encode_scene.display_settings.display_device = scene.display_settings.display_device
+        view = encode_scene.view_settings
+        view.view_transform = 'Standard'
+        view.look = 'None'
+        view.exposure = 0
+        view.gamma = 1
+
+        editor = encode_scene.sequence_editor_create()
+        strips = editor.strips if hasattr(editor, 'strips') else editor.sequences
+        strip = strips.new_image(name="frames", filepath=frame_paths[0], channel=1, frame_start=1)
+        for path in frame_paths[1:]:
+            strip.elements.append(os.path.basename(path))
+
+        encode_scene.frame_start = 1
+        encode_scene.frame_end = len(frame_paths)
+        render.filepath = filepath
+        set_movie_output(render)
+        with metrics.phase('encode', frames=len(frame_paths)):
+            bpy.ops.render.render(animation=True, scene=encode_scene.name)
+        return render.frame_path(frame=encode_scene.frame_start)
+    finally:
+        bpy.data.scenes.remove(encode_scene)
+
+
+def render_turntable_chunked(blend_file, texture_path, output_dir, render_args, workers=None, chunk_frames=DEFAULT_CHUNK_FRAMES, keep_frames=False):
+    """Render the turntable in frame chunks across Blender workers, then encode it once.
+
+    Frames go to <output_dir>/<design>_animation_frames. Chunks finished by
+    an earlier, interrupted run of the same job are skipped; the frames are
+    discarded if the texture, template or render options changed.
+
+    Returns the movie path, or None if the template has no front camera.
+    Raises RuntimeError if a chunk failed; finished chunks are kept for a retry.
+    """
+    if not bpy.data.objects.get("Camera_front_0deg"):
+        print("⚠ Warning: Front camera not found, skipping animation")
+        return None
+
+    design_name = os.path.splitext(os.path.basename(texture_path))[0]
+    frames_dir = os.path.join(output_dir, f"{design_name}_animation_frames")
+    scene = bpy.context.scene
+    chunks = frame_chunks(scene.frame_start, scene.frame_end, chunk_frames)
+
+    # Only resume frames rendered from the same inputs (by content) and options
+    job = {
+        'blend_file': [os.path.abspath(blend_file), file_hash(blend_file)],
+        'texture': [os.path.abspath(texture_path), file_hash(texture_path)],
+        'render_args': output_render_args(render_args),
+        'chunks': chunks
+    }
+    job_path = os.path.join(frames_dir, 'job.json')
+    try:
+        with open(job_path) as f:
+            resumable = json.load(f) == json.loads(json.dumps(job))
+    except (OSError, ValueError):
+        resumable = False
+    if not resumable:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+        os.makedirs(frames_dir)
+        with open(job_path, 'w') as f:
+            json.dump(job, f)
+
+    pending = [chunk for chunk in chunks if not os.path.exists(chunk_marker(frames_dir, chunk))]
+    if len(pending) < len(chunks):
+        print(f"\nResuming animation: {len(chunks) - len(pending)} of {len(chunks)} chunks already rendered")
+
+    if pending:
+        count, threads = plan_workers(len(pending), workers)
+        groups = [pending[i::count] for i in range(count)]
+        print(f"\nRendering {len(pending)} animation chunks of up to {chunk_frames} frames "
+              f"in {count} worker(s) with {threads} thread(s) each...")
+
+        processes = []
+        for group in groups:
+            command = [bpy.app.binary_path, '--background', blend_file,
+                       '--python', os.path.abspath(__file__), '--',
+                       blend_file, texture_path, output_dir] + list(render_args) + [
+                       '--animation-only', '--frames-dir', frames_dir,
+                       '--frame-chunks', ','.join(f"{start}-{end}" for start, end in group),
+                       '--threads', str(threads)]
+            processes.append(subprocess.Popen(command))
+        with metrics.phase('animation_workers', workers=len(processes), chunks=len(pending)):
+            wait_for_workers(processes)
+
+    missing = [chunk for chunk in chunks if not os.path.exists(chunk_marker(frames_dir, chunk))]
+    if missing:
+        raise RuntimeError(f"Failed to render animation frames "
+                           f"{', '.join(f'{start}-{end}' for start, end in missing)}; re-run to resume")
+
+    frame_paths = [os.path.join(frames_dir, f"frame_{frame:04d}.png")
+                   for frame in range(scene.frame_start, scene.frame_end + 1)]
+    filepath = os.path.join(output_dir, f"{design_name}_animation")
+    print(f"\nEncoding {len(frame_paths)} frames...")
+    movie_path = encode_frames(scene, frame_paths, filepath)
+    print(f"✓ Rendered animation from front camera: {design_name}_animation.mp4")
+
+    if not keep_frames:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+    return movie_path
+
+
+def render_loaded(texture_path, output_dir, samples=128, render_images=True, render_animation=True, fabric_color=None, background_color=None, quality=None, time_budget=None, cameras=None, threads=None, cache=None, engine=None, panel=None, base_texture=None, glb=None, glb_options=None):
+    """
+    Render the currently loaded template with the texture already applied
+
+    cameras optionally limits the still renders to these camera names and
+    threads fixes the render thread count for this process. With a
+    RenderCache, views rendered before with the same inputs are reused.
+    engine switches to a RENDER_ENGINES engine, e.g. 'eevee' for previews.
+    panel keeps only the cameras that see that texture panel. With
+    base_texture (the template texture without the design) and a cache,
+    stills are rendered only where the design changes them, over cached
+    renders of the blank garment (see render_stills_over_base).
+    With glb, the template is exported to that GLB path after rendering
+    (see export_loaded_glb); glb_options are export_glb.py export options.
+
+    Returns a dict with the rendered 'images' paths and the 'animation' path (or None).
+    """
+    # Set fabric color if specified (only used when rendering without composed texture)
+    # NOTE: When using --compose with fabric color, the color is already in the texture
+    # This option is for directly rendering a design on colored fabric without pre-composition
+    if fabric_color:
+        print(f"Note: Fabric color specified as RGB{fabric_color}")
+        print("WARNING: When using --compose with -f flag, fabric color is already in the texture.")
+        print("The fabric color parameter in render_design.py is ignored when texture is present.")
+        # We don't override the texture - the color should come from compose_design.py
+
+    # Setup output paths
+    design_name = os.path.splitext(os.path.basename(texture_path))[0]
+
+    scene = bpy.context.scene
+    configure_render(scene, samples, background_color, quality, time_budget, engine)
+    if threads:
+        scene.render.threads_mode = 'FIXED'
+        scene.render.threads = threads
+
+    if base_texture and not cache:
+        raise ValueError("A base texture needs a render cache (--cache-dir) for the base renders")
+
+    cache_key = None
+    base_key = None
+    if cache:
+        settings = render_settings_key(scene, background_color, quality, time_budget)
+        if base_texture:
+            base_key = cache.job_key(bpy.data.filepath, base_texture, settings)
+            # Composited stills are not interchangeable with full renders
+            settings = dict(settings, base=cache.file_hash(base_texture))
+        cache_key = cache.job_key(bpy.data.filepath, texture_path, settings)
+
+    result = {'images': [], 'animation': None}
+
+    # Render still images from all camera angles
+    if render_images and base_texture:
+        result['images'] = render_stills_over_base(scene, output_dir, design_name, base_texture,
+                                                   select_cameras(cameras, panel), cache, cache_key, base_key)
+    elif render_images:
+        result['images'] = render_stills(scene, output_dir, design_name, select_cameras(cameras, panel),
+                                         cache, cache_key)
     else:
         print("\nSkipping still image rendering (--images-only not set)")
 
     # Render animation (turntable) if requested - always use front camera
     if render_animation:
-        front_camera = bpy.data.objects.get("Camera_front_0deg")
-        if front_camera:
-            scene.camera = front_camera
-            scene.render.filepath = os.path.join(output_dir, f"{design_name}_animation")
-            scene.render.image_settings.file_format = 'FFMPEG'
-            scene.render.ffmpeg.format = 'MPEG4'
-            scene.render.ffmpeg.codec = 'H264'
-            scene.render.ffmpeg.constant_rate_factor = 'HIGH'  # Good quality
-            scene.render.ffmpeg.ffmpeg_preset = 'GOOD'
-            bpy.ops.render.render(animation=True)
-            print(f"✓ Rendered animation from front camera: {design_name}_animation.mp4")
-        else:
-            print("⚠ Warning: Front camera not found, skipping animation")
+        result['animation'] = render_turntable(scene, output_dir, design_name, cache, cache_key)
+
+    if cache:
+        print(f"Render cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses")
+
+    # Export the web model last: it re-centers the meshes for the viewer
+    if glb:
+        result['glb'] = export_loaded_glb(texture_path, glb, glb_options)
 
     # Summary
     summary_parts = []
     if render_images:
-        cameras = [obj for obj in bpy.data.objects if obj.type == 'CAMERA']
-        summary_parts.append(f"{len(cameras)} angles")
+        summary_parts.append(f"{len(result['images'])} angles")
     if render_animation:
         summary_parts.append("animation")
+    if glb:
+        summary_parts.append("GLB")
 
     print(f"\n✓ Completed rendering {design_name} - {' + '.join(summary_parts) if summary_parts else 'nothing (no render flags set)'}")
+    return result
+
+
+def replace_texture_and_render(blend_file, texture_path, output_dir, samples=128, render_images=True, render_animation=True, fabric_color=None, background_color=None, quality=None, time_budget=None, cameras=None, threads=None, cache=None, engine=None, panel=None, base_texture=None, glb=None, glb_options=None):
+    """
+    Replace texture in blend file and render image + animation
+
+    Args:
+        blend_file: Path to .blend template
+        texture_path: Path to texture image
+        output_dir: Output directory for renders
+        samples: Number of render samples (default 128, lower = faster)
+        render_images: Whether to render still images from all camera angles (default True)
+        render_animation: Whether to render animation (default True)
+        fabric_color: Optional RGB tuple (0-1 range) for fabric material color
+        background_color: Optional RGB tuple (0-1 range) or None for transparent background
+        quality: Optional quality profile name (thumbnail, preview, production)
+        time_budget: Optional time limit in seconds for each camera render
+        cameras: Optional list of camera names to render stills from (default all)
+        threads: Optional fixed render thread count
+        cache: Optional RenderCache for per-camera render reuse
+        engine: Optional render engine name (cycles, eevee, workbench)
+        panel: Optional texture panel (front_panel, back_panel) limiting the cameras
+        base_texture: Optional texture without the design, for region-of-interest stills
+        glb: Optional GLB output path, exported in this session after rendering
+        glb_options: Optional export_glb.py export options (Draco, texture size, ...)
+    """
+    # Load the blend file
+    load_blend(blend_file)
+
+    apply_texture(texture_path)
+
+    return render_loaded(texture_path, output_dir, samples, render_images, render_animation, fabric_color, background_color, quality, time_budget, cameras, threads, cache, engine, panel, base_texture, glb, glb_options)
+
+
+def load_export_module():
+    """Import export_glb.py from this script's directory (on first use only)."""
+    import export_glb
+    return export_glb
+
+
+def export_loaded_glb(texture_path, output_path, options=None):
+    """Export the loaded template with the texture to GLB using export_glb.py's steps.
+
+    Origin centering, texture setup and export run in this session, so a
+    job needs no second Blender start and template load. The scene is
+    changed for web viewers, so nothing should be rendered after this.
+
+    Returns the export report. Raises ValueError if the GLB fails validation.
+    """
+    export_glb = load_export_module()
+    export_glb.center_mesh_origins()
+    export_glb.apply_export_texture(texture_path)
+    report = export_glb.export_loaded(output_path, **(options or {}))
+    if report['validation']['issues']:
+        raise ValueError(f"Exported GLB failed validation: {'; '.join(report['validation']['issues'])}")
+    return report
+
+
+def plan_workers(camera_count, workers=None, cores=None):
+    """Return (workers, threads_per_worker) for splitting cameras across processes.
+
+    Without an explicit worker count, each worker gets at least
+    MIN_WORKER_THREADS cores and there are never more workers than cameras.
+    """
+    cores = cores or os.cpu_count() or 1
+    if not workers:
+        workers = cores // MIN_WORKER_THREADS
+    workers = max(1, min(workers, camera_count))
+    return workers, max(1, cores // workers)
+
+
+def render_stills_parallel(blend_file, texture_path, output_dir, camera_names, render_args, workers=None):
+    """Render stills in separate Blender processes, each with a share of the cameras.
+
+    Each worker runs this script with --images-only, --cameras and --threads
+    and writes the usual <design>_<angle>.png files into output_dir.
+    render_args are extra command-line options (samples, quality, colors)
+    passed to every worker.
+
+    Returns (written paths, failed camera names).
+    """
+    count, threads = plan_workers(len(camera_names), workers)
+    groups = [camera_names[i::count] for i in range(count)]
+    print(f"\nRendering {len(camera_names)} camera angles in {count} worker(s) with {threads} thread(s) each...")
+
+    processes = []
+    for group in groups:
+        command = [bpy.app.binary_path, '--background', blend_file,
+                   '--python', os.path.abspath(__file__), '--',
+                   blend_file, texture_path, output_dir] + list(render_args) + [
+                   '--images-only', '--cameras', ','.join(group), '--threads', str(threads)]
+        processes.append(subprocess.Popen(command))
+
+    with metrics.phase('stills_workers', workers=count, cameras=len(camera_names)):
+        wait_for_workers(processes)
+
+    design_name = os.path.splitext(os.path.basename(texture_path))[0]
+    outputs = []
+    failed = []
+    for process, group in zip(processes, groups):
+        for name in group:
+            angle_name = name.replace("Camera_", "")
+            path = os.path.join(output_dir, f"{design_name}_{angle_name}.png")
+            if process.returncode == 0 and os.path.exists(path):
+                outputs.append(path)
+            else:
+                failed.append(angle_name)
+
+    return outputs, failed
+
+
+def wait_for_workers(processes):
+    """Wait for worker processes, terminating any still running if interrupted."""
+    try:
+        for process in processes:
+            process.wait()
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+
+
+def benchmark_workers(blend_file, texture_path, output_dir, camera_names, render_args):
+    """Time still rendering for each worker count and report the fastest split.
+
+    Writes benchmark.json to output_dir and returns the report.
+    """
+    cores = os.cpu_count() or 1
+    results = []
+    for workers in range(1, min(len(camera_names), cores) + 1):
+        count, threads = plan_workers(len(camera_names), workers, cores)
+        run_dir = os.path.join(output_dir, f"workers_{count}")
+        os.makedirs(run_dir, exist_ok=True)
+
+        start = time.perf_counter()
+        outputs, failed = render_stills_parallel(blend_file, texture_path, run_dir,
+                                                 camera_names, render_args, count)
+        elapsed = time.perf_counter() - start
+        results.append({
+            'workers': count,
+            'threads_per_worker': threads,
+            'seconds': round(elapsed, 2),
+            'seconds_per_camera': round(elapsed / len(camera_names), 2),
+            'failed': failed
+        })
+
+    completed = [result for result in results if not result['failed']]
+    best = min(completed, key=lambda result: result['seconds']) if completed else None
+    auto_workers, _ = plan_workers(len(camera_names), cores=cores)
+
+    print(f"\nWorker split benchmark ({len(camera_names)} cameras, {cores} cores):")
+    print(f"  {'Workers':>7}  {'Threads':>7}  {'Total':>8}  {'Per camera':>10}")
+    for result in results:
+        marker = '  <- best' if result is best else ''
+        status = '  (failed)' if result['failed'] else ''
+        print(f"  {result['workers']:>7}  {result['threads_per_worker']:>7}  "
+              f"{result['seconds']:>7.1f}s  {result['seconds_per_camera']:>9.1f}s{marker}{status}")
+    if best:
+        print(f"Best split: --workers {best['workers']} (auto would pick {auto_workers})")
+
+    report = {
+        'blend_file': os.path.abspath(blend_file),
+        'texture': os.path.abspath(texture_path),
+        'cameras': camera_names,
+        'cores': cores,
+        'render_args': list(render_args),
+        'results': results,
+        'best_workers': best['workers'] if best else None,
+        'auto_workers': auto_workers
+    }
+    report_path = os.path.join(output_dir, 'benchmark.json')
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {report_path}")
+    return report
+
+
+class RenderWorker:
+    """Long-lived renderer that keeps a template loaded between jobs.
+
+    Used by --serve. The template is opened once and re-opened only when a
+    job names a different .blend file or the file changes on disk. Between
+    jobs only the texture is swapped: the material index is built once per
+    template and the job's image datablock is pointed at the new file and
+    reloaded in place, so node graphs are not rescanned or relinked and
+    images do not pile up. The template's render settings and world
+    background color are restored. Cycles
+    persistent data is enabled so scene data and the BVH survive across renders.
+    With a RenderCache, views rendered by earlier jobs are reused.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.jobs = 0
+        self.failures = 0
+        self.loads = 0
+        self._blend_version = None
+        self._settings = {}
+        self._background_color = None
+        self._image = None
+        self._materials = []
+
+        # Adopt a template Blender opened from the command line
+        if bpy.data.filepath:
+            self._adopt(bpy.data.filepath)
+
+    def handle(self, request):
+        """Handle one request and return the JSON-serializable response."""
+        command = request.get('command', 'render')
+        response = {'id': request.get('id')}
+
+        if command == 'ping':
+            response['success'] = True
+            return response
+
+        if command == 'stats':
+            response['success'] = True
+            response['stats'] = {
+                'jobs': self.jobs,
+                'failures': self.failures,
+                'template_loads': self.loads,
+                'template': self._blend_version[0] if self._blend_version else None,
+                'render_cache': dict(self.cache.stats) if self.cache else None,
+                'peak_rss_mb': peak_rss_mb()
+            }
+            return response
+
+        if command != 'render':
+            response['success'] = False
+            response['error'] = f"Unknown command '{command}'"
+            return response
+
+        start = time.perf_counter()
+        first_phase = len(metrics.phases)
+        try:
+            response.update(self._render(request))
+            response['success'] = True
+        except Exception as e:
+            print(f"Error: {e}")
+            response['success'] = False
+            response['error'] = f"Error: {e}"
+            self.failures += 1
+        self.jobs += 1
+        response['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        if metrics.enabled:
+            response['metrics'] = metrics.phases[first_phase:]
+        return response
+
+    def _render(self, request):
+        for field in ('blend_file', 'texture', 'output_dir'):
+            if not request.get(field):
+                raise ValueError(f"Missing required field '{field}'")
+
+        mode = request.get('mode', 'all')
+        if mode not in ('all', 'images-only', 'animation-only'):
+            raise ValueError(f"Unknown mode '{mode}'")
+
+        fabric_color = None
+        if request.get('fabric_color'):
+            fabric_color = parse_color_to_rgb(request['fabric_color'])
+        background_color = None
+        if request.get('background_color') and request['background_color'].lower() != 'transparent':
+            background_color = parse_color_to_rgb(request['background_color'])
+
+        quality = request.get('quality')
+        if quality and quality not in QUALITY_PROFILES:
+            raise ValueError(f"Unknown quality profile '{quality}'")
+        engine = request.get('engine')
+        if engine and engine not in RENDER_ENGINES:
+            raise ValueError(f"Unknown render engine '{engine}'")
+        cameras = request.get('cameras')
+        if isinstance(cameras, str):
+            cameras = [name.strip() for name in cameras.split(',') if name.strip()]
+        panel = request.get('panel') or (preset_panel(request['preset']) if request.get('preset') else None)
+        base_texture = request.get('base_texture')
+        if base_texture and not os.path.exists(base_texture):
+            raise FileNotFoundError(f"Base texture not found: {base_texture}")
+        samples = int(request['samples']) if request.get('samples') else None
+        time_budget = float(request['time_budget']) if request.get('time_budget') else None
+
+        texture_path = os.path.abspath(request['texture'])
+        if not os.path.exists(texture_path):
+            raise FileNotFoundError(f"Texture file not found: {request['texture']}")
+
+        self._ensure_template(request['blend_file'])
+        self._swap_texture(texture_path)
+
+        output_dir = request['output_dir']
+        os.makedirs(output_dir, exist_ok=True)
+        try:
+            return render_loaded(texture_path, output_dir, samples,
+                                 mode != 'animation-only', mode != 'images-only',
+                                 fabric_color, background_color, quality, time_budget,
+                                 cameras, cache=self.cache, engine=engine, panel=panel,
+                                 base_texture=os.path.abspath(base_texture) if base_texture else None,
+                                 glb=request.get('glb'), glb_options=request.get('glb_options'))
+        finally:
+            if request.get('glb'):
+                # The export re-centered the meshes; re-open the template for the next job
+                self._blend_version = None
+
+    def _ensure_template(self, blend_file):
+        path = os.path.abspath(blend_file)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Blend file not found: {blend_file}")
+
+        if self._blend_version != (path, os.stat(path).st_mtime_ns):
+            print(f"Loading template: {path}")
+            with metrics.phase('open_mainfile', file=os.path.basename(path)):
+                bpy.ops.wm.open_mainfile(filepath=path)
+            self._image = None
+            self._adopt(path)
+        else:
+            # Undo the previous job's quality and background overrides
+            scene = bpy.context.scene
+            for (group, name), value in self._settings.items():
+                setattr(settings_group(scene, group), name, value)
+            background = find_world_background(scene)
+            if background and self._background_color:
+                background.inputs['Color'].default_value = self._background_color
+
+    def _adopt(self, path):
+        path = os.path.abspath(path)
+        self._blend_version = (path, os.stat(path).st_mtime_ns)
+        self.loads += 1
+
+        scene = bpy.context.scene
+        scene.render.use_persistent_data = True
+        self._settings = {(group, name): getattr(settings_group(scene, group), name)
+                          for group, name in TUNED_SETTINGS if hasattr(settings_group(scene, group), name)}
+        background = find_world_background(scene)
+        self._background_color = tuple(background.inputs['Color'].default_value) if background else None
+
+        # Index the texture nodes and wire their alpha once per template
+        self._materials = index_materials()
+        connect_texture_alpha(self._materials)
+
+    def _swap_texture(self, texture_path):
+        if not self._materials:
+            raise ValueError("No 'Image Texture' node found in the template materials")
+
+        if self._image is None:
+            # First job on this template: load the image the jobs will share
+            self._image = apply_texture(texture_path, self._materials)
+            return
+
+        # Point the existing datablock at the new file; reload() replaces
+        # its pixels (and picks up new content written to the same path)
+        with metrics.phase('texture_load', file=os.path.basename(texture_path)):
+            if self._image.filepath != texture_path:
+                self._image.filepath = texture_path
+            self._image.reload()
+
+
+def render_manifest(manifest_path, defaults, report_path=None, cache=None):
+    """Render every manifest entry in this Blender session.
+
+    Entries are rendered by a RenderWorker, so the template is loaded once
+    and only the texture is swapped (reloaded in place) between
+    entries. Each entry is timed and its failure does not stop the batch.
+
+    Returns the number of failed entries.
+    """
+    with open(manifest_path) as f:
+        entries = json.load(f)
+    if isinstance(entries, dict):
+        entries = entries.get('entries', [])
+
+    worker = RenderWorker(cache)
+    results = []
+    start = time.perf_counter()
+
+    for index, entry in enumerate(entries):
+        request = dict(defaults)
+        request.update(entry)
+        request.setdefault('id', index)
+        request['command'] = 'render'
+        print(f"\n[{index + 1}/{len(entries)}] Rendering {request.get('texture')}")
+
+        result = worker.handle(request)
+        result['texture'] = request.get('texture')
+        results.append(result)
+        if result['success']:
+            print(f"✓ Entry {index + 1} done in {result['duration_ms'] / 1000:.1f}s")
+        else:
+            print(f"✗ Entry {index + 1} failed: {result['error']}")
+
+    failed = sum(1 for result in results if not result['success'])
+    elapsed = time.perf_counter() - start
+    print(f"\nBatch complete: {len(results) - failed} succeeded, {failed} failed in {elapsed:.1f}s")
+
+    if report_path:
+        report = {
+            'entries': results,
+            'succeeded': len(results) - failed,
+            'failed': failed,
+            'duration_ms': round(elapsed * 1000, 2)
+        }
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {report_path}")
+
+    return failed
+
+
+def serve_stream(worker, lines, write):
+    """Answer newline-delimited JSON requests from lines, one response per line."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            write(json.dumps({'id': None, 'success': False, 'error': f"Error: Invalid request: {e}"}) + '\n')
+            continue
+        write(json.dumps(worker.handle(request)) + '\n')
+        # The response carries the job's phases; keep a long-running server's list bounded
+        metrics.phases.clear()
+
+
+def serve(socket_path=None, cache=None):
+    """Run the render server on stdin/stdout or a Unix socket.
+
+    bpy is not thread-safe, so jobs are handled one at a time.
+    """
+    if not socket_path:
+        # Blender and the render code print progress to stdout; keep it for
+        # responses only and send everything else to stderr
+        sys.stdout.flush()
+        response_fd = os.dup(1)
+        os.dup2(2, 1)
+        responses = os.fdopen(response_fd, 'w')
+
+    # Created after the redirect: adopting a template prints progress
+    worker = RenderWorker(cache)
+
+    if socket_path:
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                def write(text):
+                    self.wfile.write(text.encode())
+                    self.wfile.flush()
+                serve_stream(worker, (line.decode() for line in self.rfile), write)
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = socketserver.UnixStreamServer(socket_path, Handler)
+        print(f"Render server listening on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+        return
+
+    def write(text):
+        responses.write(text)
+        responses.flush()
+
+    serve_stream(worker, sys.stdin, write)
+
 
 if __name__ == "__main__":
     # Parse arguments: blender file, texture, output directory, [samples], [flags]
     # Usage: -- blend_file texture_path output_dir [samples] [--images-only|--animation-only|--no-animation] [-f color] [-b color]
     args = sys.argv[sys.argv.index('--') + 1:]
 
+    # Metrics apply to every mode
+    metrics.script = 'render_design'
+    metrics_file = get_option(args, '--metrics-file')
+    metrics.enabled = '--metrics' in args or bool(metrics_file)
+    if metrics.enabled:
+        # Startup includes loading the template given on Blender's command line.
+        # The stdin server answers on stdout, so its startup is not streamed
+        metrics.stream = '--metrics' in args and '--serve' not in args
+        metrics.record('blender_startup', process_age_ms())
+        metrics.stream = '--metrics' in args
+    if metrics_file:
+        atexit.register(metrics.write, metrics_file)
+
+    # Render cache applies to every mode
+    cache = None
+    if get_option(args, '--cache-dir'):
+        try:
+            max_mb = int(get_option(args, '--cache-max-mb') or DEFAULT_RENDER_CACHE_MAX_BYTES // 1024 ** 2)
+            cache = RenderCache(get_option(args, '--cache-dir'), max_mb * 1024 ** 2)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot use render cache: {e}")
+            sys.exit(1)
+
+    if '--serve' in args:
+        serve(get_option(args, '--socket'), cache)
+        sys.exit(0)
+
+    # Quality and engine options apply to one-shot and manifest renders
+    quality = get_option(args, '--quality')
+    time_budget = get_option(args, '--time-budget')
+    engine = get_option(args, '--engine')
+    try:
+        if quality and quality not in QUALITY_PROFILES:
+            raise ValueError(f"Unknown quality profile '{quality}'. Available: {', '.join(QUALITY_PROFILES)}")
+        if engine and engine not in RENDER_ENGINES:
+            raise ValueError(f"Unknown render engine '{engine}'. Available: {', '.join(RENDER_ENGINES)}")
+        time_budget = float(time_budget) if time_budget else None
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("--time-budget must be a positive number of seconds")
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if '--manifest' in args:
+        mode = 'all'
+        if '--images-only' in args or '--no-animation' in args:
+            mode = 'images-only'
+        elif '--animation-only' in args:
+            mode = 'animation-only'
+
+        try:
+            defaults = {
+                'blend_file': args[0],
+                'samples': int(get_option(args, '--samples') or 0) or None,
+                'mode': mode,
+                'quality': quality,
+                'time_budget': time_budget,
+                'engine': engine,
+                'cameras': get_option(args, '--cameras'),
+                'panel': get_option(args, '--panel'),
+                'preset': get_option(args, '--preset'),
+                'base_texture': get_option(args, '--base-texture'),
+                'fabric_color': get_option(args, '-f', '--fabric-color'),
+                'background_color': get_option(args, '-b', '--background-color')
+            }
+            for color in (defaults['fabric_color'], defaults['background_color']):
+                if color and color.lower() != 'transparent':
+                    parse_color_to_rgb(color)
+            failed = render_manifest(get_option(args, '--manifest'), defaults, get_option(args, '--report'), cache)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
+
     blend_file = args[0]
     texture_path = args[1]
     output_dir = args[2]
-    samples = int(args[3]) if len(args) > 3 and args[3].isdigit() else 128
+    samples = int(args[3]) if len(args) > 3 and args[3].isdigit() else (None if quality or engine else 128)
 
     # Determine what to render based on flags
     render_images = True
@@ -273,9 +1758,111 @@ if __name__ == "__main__":
                 bg_input = args[idx + 1]
                 if bg_input.lower() != 'transparent':
                     background_color = parse_color_to_rgb(bg_input)
+
+        # Camera selection and worker options
+        cameras = get_option(args, '--cameras')
+        cameras = [name.strip() for name in cameras.split(',') if name.strip()] if cameras else None
+        threads = int(get_option(args, '--threads')) if get_option(args, '--threads') else None
+        workers = get_option(args, '--workers')
+        if workers is not None:
+            workers = 0 if workers == 'auto' else int(workers)
+        panel = get_option(args, '--panel')
+        if not panel and get_option(args, '--preset'):
+            panel = preset_panel(get_option(args, '--preset'))
+        if panel and panel not in PANEL_CAMERAS:
+            raise ValueError(f"Unknown panel '{panel}'. Available: {', '.join(PANEL_CAMERAS)}")
+        base_texture = get_option(args, '--base-texture')
+        if base_texture:
+            if not os.path.exists(base_texture):
+                raise ValueError(f"Base texture not found: {base_texture}")
+            if not cache:
+                raise ValueError("--base-texture needs --cache-dir for the base renders")
+        glb = get_option(args, '--glb')
+        glb_options = None
+        if glb:
+            glb_options = load_export_module().parse_export_options(args)
+            if get_option(args, '--glb-report'):
+                glb_options['report_path'] = get_option(args, '--glb-report')
+        chunk_frames = get_option(args, '--chunk-frames')
+        chunk_frames = int(chunk_frames) if chunk_frames else None
+        if chunk_frames is not None and chunk_frames < 1:
+            raise ValueError("--chunk-frames must be at least 1")
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
     os.makedirs(output_dir, exist_ok=True)
-    replace_texture_and_render(blend_file, texture_path, output_dir, samples, render_images, render_animation, fabric_color, background_color)
+
+    if '--frame-chunks' in args:
+        # Worker for a chunked turntable (see render_turntable_chunked)
+        load_blend(blend_file)
+        apply_texture(texture_path)
+        scene = bpy.context.scene
+        configure_render(scene, samples, background_color, quality, time_budget, engine)
+        if threads:
+            scene.render.threads_mode = 'FIXED'
+            scene.render.threads = threads
+        chunks = [tuple(int(frame) for frame in chunk.split('-'))
+                  for chunk in get_option(args, '--frame-chunks').split(',')]
+        try:
+            render_frame_chunks(scene, get_option(args, '--frames-dir'), chunks)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    if workers is not None or chunk_frames or '--benchmark' in args:
+        # Split still cameras and turntable chunks across separate Blender processes
+        # Stop the workers too when the caller kills this process (e.g. on timeout)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+        load_blend(blend_file)
+        try:
+            camera_names = [camera.name for camera in select_cameras(cameras, panel)]
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        render_args = [args[3]] if len(args) > 3 and args[3].isdigit() else []
+        for flag, value in (('--quality', quality), ('--time-budget', time_budget), ('--engine', engine),
+                            ('-f', get_option(args, '-f', '--fabric-color')),
+                            ('-b', get_option(args, '-b', '--background-color')),
+                            ('--cache-dir', get_option(args, '--cache-dir')),
+                            ('--cache-max-mb', get_option(args, '--cache-max-mb')),
+                            ('--base-texture', base_texture)):
+            if value:
+                render_args += [flag, str(value)]
+        if metrics.stream:
+            render_args.append('--metrics')
+
+        if '--benchmark' in args:
+            benchmark_workers(blend_file, texture_path, output_dir, camera_names, render_args)
+            sys.exit(0)
+
+        if render_images:
+            outputs, failed = render_stills_parallel(blend_file, texture_path, output_dir,
+                                                     camera_names, render_args, workers)
+            if failed:
+                print(f"Error: Failed to render camera(s): {', '.join(failed)}")
+                sys.exit(1)
+            print(f"\n✓ Rendered {len(outputs)} angles in parallel")
+        if render_animation:
+            try:
+                render_turntable_chunked(blend_file, texture_path, output_dir, render_args, workers,
+                                         chunk_frames or DEFAULT_CHUNK_FRAMES, '--keep-frames' in args)
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        if glb:
+            apply_texture(texture_path)
+            try:
+                export_loaded_glb(texture_path, glb, glb_options)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        sys.exit(0)
+
+    try:
+        replace_texture_and_render(blend_file, texture_path, output_dir, samples, render_images, render_animation, fabric_color, background_color, quality, time_budget, cameras, threads, cache, engine, panel, base_texture, glb, glb_options)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
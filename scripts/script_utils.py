@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the Blender scripts (render_design.py and export_glb.py):
+command-line option lookup, file hashing and per-phase metrics.
+
+Does not import bpy. The scripts add their directory to sys.path before
+importing it, because Blender does not put a --python script's directory there.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def get_option(args, *names):
+    """Return the value following the first of names present in args, or None."""
+    for name in names:
+        if name in args:
+            idx = args.index(name)
+            if idx + 1 < len(args):
+                return args[idx + 1]
+    return None
+
+
+def file_hash(path):
+    """Return the sha256 of a file's contents."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def process_age_ms():
+    """Return the milliseconds since this process started (Linux only), or None."""
+    try:
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round((uptime - start_ticks / os.sysconf('SC_CLK_TCK')) * 1000, 2)
+
+
+def peak_rss_mb(children=False):
+    """Return the peak resident set size of this process (or its finished children) in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return round(peak / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)
+
+
+class PhaseMetrics:
+    """Machine-readable timings of a script's phases.
+
+    Every phase (template open, texture load, each camera render, export,
+    ...) is recorded with its duration, the peak RSS so far and fields
+    such as the camera and sample count. With stream set each phase is also
+    printed as a JSON line ({"metric": ...}) as it finishes; write() saves a
+    summary with all phases to a sidecar file.
+    """
+
+    def __init__(self, script=None):
+        self.script = script
+        self.phases = []
+        self.stream = False
+        self.enabled = False
+
+    @contextlib.contextmanager
+    def phase(self, name, **fields):
+        """Time the enclosed block; the yielded dict takes extra fields."""
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.record(name, round((time.perf_counter() - start) * 1000, 2), **fields)
+
+    def record(self, name, duration_ms, **fields):
+        entry = {'phase': name, 'duration_ms': duration_ms, **fields, 'peak_rss_mb': peak_rss_mb()}
+        self.phases.append(entry)
+        if self.stream:
+            print(json.dumps({'metric': name, **{k: v for k, v in entry.items() if k != 'phase'}}), flush=True)
+
+    def summary(self):
+        return {
+            'script': self.script,
+            'total_ms': process_age_ms(),
+            'peak_rss_mb': peak_rss_mb(),
+            'children_peak_rss_mb': peak_rss_mb(children=True),
+            'phases': self.phases
+        }
+
+    def write(self, path):
+        """Write the summary as JSON to path (through a temporary file)."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+# Phase timings of this process (see --metrics and --metrics-file), shared by
+# both scripts when render_design.py exports a GLB in its own session. The
+# running script sets metrics.script.
+metrics = PhaseMetrics()